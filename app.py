@@ -399,28 +399,22 @@
 
 import streamlit as st
 import pandas as pd
-import sys
+import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pacsv
 import os
+import json
 from pathlib import Path
 import warnings
 
-# Import utility modules
+# Import utility modules (tab modules and the pipeline are imported where used)
 try:
-    from utils.scraper_init import IFSCScraper
-    from utils.main import IFSCDataManager
-    from utils.data_aggregator import IFSCDataAggregator
     from utils.elo_scoring import ELOCalculator
-    from utils import streamlit_elo
-    from utils import streamlit_overview
-    from utils import streamlit_countries
-    from utils import streamlit_athlete
 except ImportError as e:
     st.error(f"Import error: {e}")
     st.error("Please ensure all utility modules are in the 'utils/' directory")
     st.stop()
 
-warnings.filterwarnings('ignore')
-
 # Page configuration
 st.set_page_config(
     page_title="Climbing Competition Analysis",
@@ -429,24 +423,41 @@ st.set_page_config(
     initial_sidebar_state="collapsed"
 )
 
-@st.cache_resource
-def load_components():
-    """Initialize analysis components."""
-    try:
-        aggregator = IFSCDataAggregator()
-        calculator = ELOCalculator()
-        return aggregator, calculator
-    except Exception as e:
-        st.error(f"Error initializing components: {e}")
-        return None, None
+# Data locations written by the pipeline
+AGG_DIR = Path("Data/aggregate_data")
+AGG_CSV = AGG_DIR / "aggregated_results.csv"
+AGG_PARQUET = AGG_DIR / "aggregated_results.parquet"
+OVERVIEW_JSON = AGG_DIR / "overview.json"
+LEAGUES_CSV = Path("IFSC_Data/all_years_leagues.csv")
+
+# Only the columns the overview needs, with compact dtypes
+OVERVIEW_DTYPES = {
+    'name': 'category',
+    'country': 'category',
+    'discipline': 'category',
+    'gender': 'category',
+    'year': 'int16',
+}
+
+# One calculator at a time; once it expires the cache drops its only reference
+@st.cache_resource(ttl="6h", max_entries=1)
+def get_elo_calculator():
+    """Initialize the ELO calculator, only once the ELO tab is opened."""
+    return ELOCalculator()
 
 def check_data_availability():
     """Check if required data files exist."""
     required_paths = [
-        Path("Data/aggregate_data"),
+        AGG_DIR,
     ]
     
-    missing_paths = [p for p in required_paths if not p.exists()]
+    # One read of Data/ rather than a stat() per required directory
+    try:
+        with os.scandir(AGG_DIR.parent) as entries:
+            present = {entry.name for entry in entries if entry.is_dir()}
+    except FileNotFoundError:
+        present = set()
+    missing_paths = [p for p in required_paths if p.name not in present]
     
     if missing_paths:
         st.error("Missing required data directories:")
@@ -468,17 +479,88 @@ def check_data_availability():
     
     return True
 
+def _category_counts(series: pd.Series) -> dict:
+    """Count rows per category in one pass over the integer codes."""
+    codes = series.cat.codes.to_numpy()
+    counts = np.bincount(codes[codes >= 0], minlength=len(series.cat.categories))
+    return dict(zip(series.cat.categories.tolist(), counts.tolist()))
+
+@st.cache_data(persist="disk", show_spinner=False)
+def _compute_overview(path: str, mtime: float, size: int) -> dict:
+    """Compute overview stats for one version of the aggregated file.
+    
+    mtime and size are only part of the cache key, so the cached result
+    is invalidated whenever the pipeline rewrites the file. That is also
+    why no ttl is set: Streamlit ignores it for disk-persisted caches.
+    """
+    if path.endswith('.parquet'):
+        df = pd.read_parquet(path, columns=list(OVERVIEW_DTYPES)).astype(OVERVIEW_DTYPES)
+    else:
+        # Arrow only parses the projected columns, using multiple threads
+        table = pacsv.read_csv(
+            path,
+            read_options=pacsv.ReadOptions(block_size=1 << 20, use_threads=True),
+            convert_options=pacsv.ConvertOptions(
+                include_columns=list(OVERVIEW_DTYPES),
+                column_types={'year': pa.int16()},
+                strings_can_be_null=True,
+            ),
+        )
+        df = table.to_pandas().astype(OVERVIEW_DTYPES)
+    if df.empty:
+        return {}
+    
+    # Categories only hold observed values, so their size is the distinct count
+    return {
+        'total_records': len(df),
+        'unique_athletes': df['name'].cat.categories.size,
+        'unique_countries': df['country'].cat.categories.size,
+        'year_range': (int(df['year'].min()), int(df['year'].max())),
+        'disciplines': _category_counts(df['discipline']),
+        'genders': _category_counts(df['gender']),
+    }
+
+def get_data_overview():
+    """Get basic data overview."""
+    try:
+        # Load the newer of the two files; max keeps the Parquet copy on a tie
+        stats = {}
+        for path in (AGG_PARQUET, AGG_CSV):
+            try:
+                stats[path] = path.stat()
+            except FileNotFoundError:
+                pass
+        if not stats:
+            return {}
+        agg_file = max(stats, key=lambda path: stats[path].st_mtime)
+        stat = stats[agg_file]
+        
+        # The pipeline precomputes the overview; trust it unless the data file is newer
+        try:
+            if OVERVIEW_JSON.stat().st_mtime >= stat.st_mtime:
+                overview = json.loads(OVERVIEW_JSON.read_text())
+                overview['year_range'] = tuple(overview['year_range'])
+                return overview
+        except FileNotFoundError:
+            pass
+        
+        return _compute_overview(str(agg_file), stat.st_mtime, stat.st_size)
+    except Exception as e:
+        st.error(f"Error getting data overview: {e}")
+        return {}
+
 def run_data_pipeline():
     """Run the complete data pipeline if needed."""
     if st.button("🔄 Run Full Data Pipeline"):
         with st.spinner("Running data pipeline... This may take several minutes."):
             try:
+                from utils.main import IFSCDataManager
+                
                 # Initialize manager and run
                 manager = IFSCDataManager()
                 
                 # Check if we need initial fetch
-                leagues_file = Path("IFSC_Data/all_years_leagues.csv")
-                if not leagues_file.exists():
+                if not LEAGUES_CSV.exists():
                     st.info("No existing data found. Running initial fetch...")
                     manager.initial_data_fetch(test_mode=True)  # Use test mode for faster demo
                 else:
@@ -486,64 +568,103 @@ def run_data_pipeline():
                     manager.update_existing_data()
                 
                 st.success("Data pipeline completed successfully!")
+                st.session_state.pop('data_ok', None)
+                st.session_state.pop('overview_totals', None)
                 st.rerun()
                 
             except Exception as e:
                 st.error(f"Pipeline error: {e}")
                 st.exception(e)
 
+def _safe_render(name, fn, *args):
+    """Render a tab, showing any error inline instead of stopping the app."""
+    try:
+        fn(*args)
+    except Exception as e:
+        st.error(f"Error in {name} tab: {e}")
+        st.exception(e)
+
 def main():
     # Header
     st.title("🧗‍♂️ Climbing Competition Analysis Dashboard")
     
-    # Check data availability
-    if not check_data_availability():
+    # Check data availability; once it passes, skip the filesystem check on reruns
+    if not st.session_state.get('data_ok'):
+        st.session_state['data_ok'] = check_data_availability()
+    if not st.session_state['data_ok']:
         st.subheader("Setup Required")
         run_data_pipeline()
         return
     
-    # Load components
-    aggregator, calculator = load_components()
+    # Get data overview
+    overview = get_data_overview()
     
-    if None in (aggregator, calculator):
-        st.error("Failed to initialize analysis components.")
+    if not overview or overview.get('total_records', 0) == 0:
+        st.warning("No competition data found.")
+        run_data_pipeline()
         return
     
-    # Create tabs for different analyses
-    tab1, tab2, tab3, tab4 = st.tabs([
-        "ELO Rankings", 
-        "Overview", 
-        "Countries",
-        "Athletes & Analytics"
-    ])
-    
-    with tab1:
+    # Keep the sidebar numbers as a plain tuple so reruns skip the overview dict
+    if 'overview_totals' not in st.session_state:
+        year_range = overview.get('year_range', (0, 0))
+        st.session_state['overview_totals'] = (
+            overview.get('total_records', 0),
+            overview.get('unique_athletes', 0),
+            overview.get('unique_countries', 0),
+            year_range[0],
+            year_range[1],
+        )
+    total_records, athletes, countries, first_year, last_year = st.session_state['overview_totals']
+    
+    # Display basic stats in sidebar
+    with st.sidebar:
+        st.subheader("📊 Data Overview")
+        st.metric("Total Records", f"{total_records:,}")
+        st.metric("Athletes", f"{athletes:,}")
+        st.metric("Countries", f"{countries:,}")
+        st.metric("Years", f"{first_year}-{last_year}")
+        
+        # Refresh button
+        if st.button("🔄 Refresh Data"):
+            st.cache_data.clear()
+            st.cache_resource.clear()
+            st.session_state.pop('data_ok', None)
+            st.session_state.pop('overview_totals', None)
+            st.rerun()
+    
+    # Select the active view; unlike st.tabs, only the selected one is rendered
+    active_tab = st.radio(
+        "View",
+        ["ELO Rankings", "Overview", "Countries", "Athletes & Analytics"],
+        horizontal=True,
+        key='active_tab',
+        label_visibility="collapsed"
+    )
+    
+    if active_tab == "ELO Rankings":
         try:
-            streamlit_elo.render(None, calculator, None)
+            calculator = get_elo_calculator()
         except Exception as e:
-            st.error(f"Error in ELO tab: {e}")
-            st.exception(e)
+            st.error(f"Error initializing ELO calculator: {e}")
+            return
+        
+        from utils import streamlit_elo
+        _safe_render("ELO", streamlit_elo.render, None, calculator, None)
     
-    with tab2:
-        try:
-            streamlit_overview.render()
-        except Exception as e:
-            st.error(f"Error in Overview tab: {e}")
-            st.exception(e)
+    elif active_tab == "Overview":
+        from utils import streamlit_overview
+        _safe_render("Overview", streamlit_overview.render)
     
-    with tab3:
-        try:
-            streamlit_countries.render()
-        except Exception as e:
-            st.error(f"Error in Countries tab: {e}")
-            st.exception(e)
+    elif active_tab == "Countries":
+        from utils import streamlit_countries
+        _safe_render("Countries", streamlit_countries.render)
     
-    with tab4:
-        try:
-            streamlit_athlete.render()
-        except Exception as e:
-            st.error(f"Error in Athletes tab: {e}")
-            st.exception(e)
+    elif active_tab == "Athletes & Analytics":
+        from utils import streamlit_athlete
+        _safe_render("Athletes", streamlit_athlete.render)
 
 if __name__ == "__main__":
+    # Only silence pandas deprecation and mixed-dtype notices, so other warnings still show
+    warnings.filterwarnings('ignore', category=FutureWarning)
+    warnings.filterwarnings('ignore', category=pd.errors.DtypeWarning)
     main()
\ No newline at end of file
@@ -0,0 +1,46 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import pandas as pd
+
+from utils.analysis import ClimbingAnalyzer
+
+
+class CleanCacheTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.data_dir = Path(self._tmp.name)
+        agg_dir = self.data_dir / 'aggregate_data'
+        agg_dir.mkdir()
+        pd.DataFrame({
+            'name': [' Adam Ondra ', 'Janja Garnbret', 'Jakob Schubert'],
+            'country': ['cze', 'SLO', 'AUT'],
+            'discipline': ['Lead', 'Boulder', 'Lead'],
+            'gender': ['Men', 'Women', 'Men'],
+            'year': [2019, 2021, 2019],
+            'round_rank': [1, None, 2],
+            'start_date': ['2019-07-12', '2021-05-21', '2019-07-12'],
+            'event_name': ['IFSC World Cup Villars 2019', 'IFSC World Cup Salt Lake City 2021', None],
+            'scoring_era': ['IFSC_Modern', 'IFSC_ZoneTop', 'IFSC_Modern'],
+            'round_score': ['TOP', '4T4z 5 4', '41+'],
+            '1/2_winner': [True, None, False],
+        }).to_csv(agg_dir / 'aggregated_results.csv', index=False)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_cached_load_matches_fresh_load(self):
+        fresh = ClimbingAnalyzer(str(self.data_dir)).aggregated_df
+        self.assertTrue((self.data_dir / 'aggregate_data' / 'aggregated_results.clean.parquet').exists())
+
+        cached = ClimbingAnalyzer(str(self.data_dir)).aggregated_df
+
+        self.assertEqual(fresh.dtypes.to_dict(), cached.dtypes.to_dict())
+        for col in ['country', 'discipline', 'gender']:
+            self.assertEqual(fresh[col].cat.categories.dtype, cached[col].cat.categories.dtype)
+        pd.testing.assert_frame_equal(fresh, cached)
+
+
+if __name__ == '__main__':
+    unittest.main()
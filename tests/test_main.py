@@ -0,0 +1,44 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+import pandas as pd
+
+from utils.main import IFSCDataManager
+
+
+class SavedListingTest(unittest.TestCase):
+    def setUp(self):
+        self._cwd = os.getcwd()
+        self._tmp = tempfile.TemporaryDirectory()
+        os.chdir(self._tmp.name)
+        self.manager = IFSCDataManager(api_cache=None)
+
+    def tearDown(self):
+        self.manager.scraper.close()
+        os.chdir(self._cwd)
+        self._tmp.cleanup()
+
+    def test_missing_urls_read_back_as_none(self):
+        # A round the API lists without results, as get_events_from_league returns it
+        events = pd.DataFrame([{
+            'event_name': 'IFSC World Cup Innsbruck 2015', 'event_id': 1, 'year': 2015,
+            'location': 'Innsbruck', 'discipline': 'Lead', 'gender': 'Men', 'round': 'Final',
+            'start_date': '2015-06-20', 'category_round_results': None, 'event_results': None,
+        }])
+        meta_file = Path(self.manager.metadata_dir) / '2015_event_meta.csv'
+        events.to_csv(meta_file, index=False)
+
+        listing = self.manager._saved_listing(meta_file)
+
+        event = listing.to_dict('records')[0]
+        self.assertIsNone(event['category_round_results'])
+        self.assertIsNone(event['event_results'])
+        self.assertEqual(listing['year'].dtype, 'int64')
+        # Without a result url the round is skipped rather than requested
+        self.assertTrue(self.manager.scraper.parse_round_result(event).empty)
+
+
+if __name__ == '__main__':
+    unittest.main()
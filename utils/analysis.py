@@ -1,11 +1,28 @@
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+import os
 from pathlib import Path
 from typing import Dict, Optional, Tuple
 import logging
 import warnings
 
-warnings.filterwarnings('ignore')
+# Column types known up front, so read_csv skips inferring them
+READ_DTYPES = {
+    'year': 'Int16',
+    'round_rank': 'Int16',
+    'country': 'category',
+    'discipline': 'category',
+    'gender': 'category',
+}
+PARSE_DATES = ['start_date']
+DATE_FORMAT = 'ISO8601'
+
+# Text columns the cleaning step trims into Arrow strings
+TEXT_COLUMNS = ['name', 'country', 'discipline', 'gender']
+ARROW_STRING = pd.ArrowDtype(pa.string())
 
 class ClimbingAnalyzer:
     """Optimized climbing competition data analyzer with robust error handling."""
@@ -14,6 +31,7 @@ class ClimbingAnalyzer:
         self.data_dir = Path(data_dir)
         self.aggregated_df = None
         self.era_files = {}
+        self._cols = frozenset()
         
         # Setup logging
         logging.basicConfig(level=logging.INFO)
@@ -39,10 +57,20 @@ class ClimbingAnalyzer:
         
         # Load main aggregated file
         agg_file = self.data_dir / "aggregate_data" / "aggregated_results.csv"
+        cache_file = agg_file.with_name("aggregated_results.clean.parquet")
         if agg_file.exists():
             try:
-                self.aggregated_df = pd.read_csv(agg_file)
-                self._clean_aggregated_data()
+                # Reuse the cleaned copy unless the CSV was rewritten after it
+                if cache_file.exists() and cache_file.stat().st_mtime >= agg_file.stat().st_mtime:
+                    self.aggregated_df = self._read_clean_cache(cache_file)
+                else:
+                    # The score columns mix numbers and text; that is expected here
+                    with warnings.catch_warnings():
+                        warnings.simplefilter('ignore', category=pd.errors.DtypeWarning)
+                        self.aggregated_df = pd.read_csv(agg_file, dtype=READ_DTYPES, parse_dates=PARSE_DATES, date_format=DATE_FORMAT, engine='c')
+                    self._clean_aggregated_data()
+                    self._save_clean_cache(cache_file)
+                self._cols = frozenset(self.aggregated_df.columns)
                 self.logger.info(f"Loaded aggregated data: {len(self.aggregated_df)} records")
             except Exception as e:
                 self.logger.error(f"Error loading aggregated data: {e}")
@@ -50,47 +78,37 @@ class ClimbingAnalyzer:
         # Load era-specific files
         era_dir = self.data_dir / "aggregate_data"
         if era_dir.exists():
-            for csv_file in era_dir.glob("*.csv"):
-                if csv_file.name != "aggregated_results.csv":
-                    try:
-                        era_data = pd.read_csv(csv_file)
-                        if not era_data.empty:
-                            self.era_files[csv_file.stem] = era_data
-                            self.logger.info(f"Loaded era file: {csv_file.stem}")
-                    except Exception as e:
-                        self.logger.warning(f"Error loading {csv_file}: {e}")
+            # A Parquet era file replaces the CSV of the same name
+            era_paths = {}
+            with os.scandir(era_dir) as entries:
+                for entry in entries:
+                    if not entry.is_file() or entry.name.startswith("aggregated_results."):
+                        continue
+                    if entry.name.endswith(".parquet"):
+                        era_paths[entry.name[:-len(".parquet")]] = entry.path
+                    elif entry.name.endswith(".csv"):
+                        era_paths.setdefault(entry.name[:-len(".csv")], entry.path)
+            for stem, era_path in era_paths.items():
+                try:
+                    era_data = pd.read_parquet(era_path) if era_path.endswith(".parquet") else pd.read_csv(era_path)
+                    if not era_data.empty:
+                        self.era_files[stem] = era_data
+                        self.logger.info(f"Loaded era file: {stem}")
+                except Exception as e:
+                    self.logger.warning(f"Error loading {era_path}: {e}")
     
     def _clean_aggregated_data(self):
         """Clean and optimize the main dataset."""
         if self.aggregated_df is None:
             return
         
-        # Convert date columns efficiently
-        date_columns = ['start_date', 'comp_date']
-        for col in date_columns:
-            if col in self.aggregated_df.columns:
-                self.aggregated_df[col] = pd.to_datetime(
-                    self.aggregated_df[col], errors='coerce'
-                )
-        
-        # Optimize numeric columns
-        numeric_columns = ['year', 'round_rank']
-        for col in numeric_columns:
+        # Clean text columns with Arrow string kernels; missing values become ''
+        # (dates and numbers are typed by read_csv)
+        for col in TEXT_COLUMNS:
             if col in self.aggregated_df.columns:
-                self.aggregated_df[col] = pd.to_numeric(
-                    self.aggregated_df[col], errors='coerce'
-                )
-        
-        # Clean text columns
-        text_columns = ['name', 'country', 'discipline', 'gender']
-        for col in text_columns:
-            if col in self.aggregated_df.columns:
-                self.aggregated_df[col] = (
-                    self.aggregated_df[col]
-                    .astype(str)
-                    .str.strip()
-                    .str.replace('nan', '')
-                )
+                values = pa.array(self.aggregated_df[col].to_numpy(dtype=object), type=pa.string(), from_pandas=True)
+                values = pc.replace_substring(pc.utf8_trim_whitespace(values.fill_null('')), 'nan', '')
+                self.aggregated_df[col] = pd.arrays.ArrowExtensionArray(values)
         
         # Remove invalid records
         if 'name' in self.aggregated_df.columns:
@@ -102,6 +120,50 @@ class ClimbingAnalyzer:
         # Standardize country codes
         if 'country' in self.aggregated_df.columns:
             self.aggregated_df['country'] = self.aggregated_df['country'].str.upper()
+        
+        # Store low-cardinality text as categories for faster filters and groupbys
+        category_columns = ['country', 'discipline', 'gender', 'comp_discipline', 'comp_gender', 'scoring_era']
+        for col in category_columns:
+            if col in self.aggregated_df.columns:
+                self.aggregated_df[col] = self.aggregated_df[col].astype('category')
+        
+        # Keep the remaining plain-text columns in Arrow memory instead of one
+        # Python str per cell; columns mixing numbers and text stay as objects
+        arrow_text = {
+            col: ARROW_STRING for col in self.aggregated_df.select_dtypes(include='object').columns
+            if pd.api.types.infer_dtype(self.aggregated_df[col], skipna=True) in ('string', 'empty')
+        }
+        self.aggregated_df = self.aggregated_df.astype(arrow_text)
+    
+    def _save_clean_cache(self, cache_file: Path):
+        """Write the cleaned dataset to Parquet so later loads skip the CSV."""
+        # Parquet needs one type per column, e.g. P1_Top mixes tries and 'X'
+        mixed_cols = {
+            col: 'string' for col in self.aggregated_df.select_dtypes(include='object').columns
+            if pd.api.types.infer_dtype(self.aggregated_df[col], skipna=True) in ('mixed', 'mixed-integer')
+        }
+        try:
+            self.aggregated_df.astype(mixed_cols).to_parquet(cache_file, compression='zstd')
+        except Exception as e:
+            self.logger.warning(f"Could not write cleaned data cache: {e}")
+    
+    def _read_clean_cache(self, cache_file: Path) -> pd.DataFrame:
+        """Read the cleaned dataset back with the dtypes _clean_aggregated_data gives it."""
+        # pd.read_parquet would return Arrow text as StringDtype, so map it explicitly
+        df = pq.read_table(cache_file).to_pandas(
+            types_mapper={pa.string(): ARROW_STRING, pa.large_string(): ARROW_STRING}.get
+        )
+        # Parquet dictionaries come back with object categories; the cleaned
+        # text columns had Arrow ones
+        arrow_categories = {
+            col: pd.CategoricalDtype(df[col].cat.categories.astype(ARROW_STRING), ordered=df[col].cat.ordered)
+            for col in TEXT_COLUMNS if col in df.columns and isinstance(df[col].dtype, pd.CategoricalDtype)
+        }
+        df = df.astype(arrow_categories)
+        # Object columns such as 1/2_winner read missing values back as None, read_csv gives NaN
+        object_cols = df.select_dtypes(include='object').columns
+        df[object_cols] = df[object_cols].fillna(np.nan)
+        return df
     
     def get_data_overview(self) -> Dict:
         """Generate comprehensive data overview with error handling."""
@@ -121,33 +183,35 @@ class ClimbingAnalyzer:
             valid_disciplines = ['Boulder', 'Lead', 'Speed', 'B', 'L', 'S']
             
             # Use discipline column if available, otherwise use comp_discipline
-            discipline_col = 'discipline' if 'discipline' in self.aggregated_df.columns else 'comp_discipline'
-            
-            if discipline_col in self.aggregated_df.columns:
-                filtered_df = self.aggregated_df[
-                    self.aggregated_df[discipline_col].isin(valid_disciplines)
-                ]
-            else:
-                filtered_df = self.aggregated_df
+            discipline_col = 'discipline' if 'discipline' in self._cols else 'comp_discipline'
             
             # Use gender column if available, otherwise use comp_gender
-            gender_col = 'gender' if 'gender' in self.aggregated_df.columns else 'comp_gender'
+            gender_col = 'gender' if 'gender' in self._cols else 'comp_gender'
+            
+            # Slice only the columns the overview reads, so filtering copies little
+            overview_cols = ['name', 'country', 'year', discipline_col, gender_col]
+            source_df = self.aggregated_df[[col for col in overview_cols if col in self._cols]]
+            
+            if discipline_col in self._cols:
+                filtered_df = source_df[self._isin_mask(source_df[discipline_col], valid_disciplines)]
+            else:
+                filtered_df = source_df
             
             overview = {
                 'total_records': len(filtered_df),
-                'unique_athletes': filtered_df['name'].nunique() if 'name' in filtered_df.columns else 0,
-                'unique_countries': filtered_df['country'].nunique() if 'country' in filtered_df.columns else 0,
+                'unique_athletes': filtered_df['name'].nunique() if 'name' in self._cols else 0,
+                'unique_countries': filtered_df['country'].nunique() if 'country' in self._cols else 0,
                 'year_range': (
-                    int(filtered_df['year'].min()) if 'year' in filtered_df.columns else 0,
-                    int(filtered_df['year'].max()) if 'year' in filtered_df.columns else 0
+                    int(filtered_df['year'].min()) if 'year' in self._cols else 0,
+                    int(filtered_df['year'].max()) if 'year' in self._cols else 0
                 ),
                 'disciplines': (
-                    filtered_df[discipline_col].value_counts().to_dict() 
-                    if discipline_col in filtered_df.columns else {}
+                    filtered_df[discipline_col].value_counts().loc[lambda c: c > 0].to_dict() 
+                    if discipline_col in self._cols else {}
                 ),
                 'genders': (
-                    filtered_df[gender_col].value_counts().to_dict() 
-                    if gender_col in filtered_df.columns else {}
+                    filtered_df[gender_col].value_counts().loc[lambda c: c > 0].to_dict() 
+                    if gender_col in self._cols else {}
                 ),
                 'era_files': list(self.era_files.keys())
             }
@@ -171,44 +235,53 @@ class ClimbingAnalyzer:
         if df is None or df.empty:
             return pd.DataFrame()
         
-        filtered_df = df.copy()
+        cols = frozenset(df.columns)
+        
+        # Combine every filter into one mask and slice once at the end
+        mask = np.ones(len(df), dtype=bool)
         
         try:
             # Year range filter
-            if filters.get('year_range') and 'year' in filtered_df.columns:
+            if filters.get('year_range') and 'year' in cols:
                 start_year, end_year = filters['year_range']
-                filtered_df = filtered_df[
-                    (filtered_df['year'] >= start_year) & 
-                    (filtered_df['year'] <= end_year)
-                ]
+                mask &= df['year'].between(start_year, end_year).to_numpy(dtype=bool, na_value=False)
             
             # Discipline filter
             if filters.get('disciplines'):
-                discipline_col = 'discipline' if 'discipline' in filtered_df.columns else 'comp_discipline'
-                if discipline_col in filtered_df.columns:
-                    filtered_df = filtered_df[
-                        filtered_df[discipline_col].isin(filters['disciplines'])
-                    ]
+                discipline_col = 'discipline' if 'discipline' in cols else 'comp_discipline'
+                if discipline_col in cols:
+                    mask &= self._isin_mask(df[discipline_col], filters['disciplines'])
             
             # Gender filter
             if filters.get('genders'):
-                gender_col = 'gender' if 'gender' in filtered_df.columns else 'comp_gender'
-                if gender_col in filtered_df.columns:
-                    filtered_df = filtered_df[
-                        filtered_df[gender_col].isin(filters['genders'])
-                    ]
+                gender_col = 'gender' if 'gender' in cols else 'comp_gender'
+                if gender_col in cols:
+                    mask &= self._isin_mask(df[gender_col], filters['genders'])
             
             # Country filter
-            if filters.get('countries') and 'country' in filtered_df.columns:
-                filtered_df = filtered_df[
-                    filtered_df['country'].isin(filters['countries'])
-                ]
+            if filters.get('countries') and 'country' in cols:
+                mask &= self._isin_mask(df['country'], filters['countries'])
             
         except Exception as e:
             self.logger.error(f"Error applying filters: {e}")
             return df  # Return original data if filtering fails
         
-        return filtered_df
+        return df[mask]
+    
+    def _isin_mask(self, series: pd.Series, values) -> np.ndarray:
+        """Membership mask; categorical columns are matched on their integer codes."""
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            # Lookup table over the codes; the extra last slot catches -1 (missing)
+            wanted = series.cat.categories.get_indexer(list(values))
+            lookup = np.zeros(len(series.cat.categories) + 1, dtype=bool)
+            lookup[wanted[wanted >= 0]] = True
+            return lookup[series.cat.codes.to_numpy()]
+        return series.isin(values).to_numpy()
+    
+    def _stats_columns(self, needed: list) -> list:
+        """Columns a stats groupby reduces, plus the ones filter_data may read."""
+        filter_cols = ['year', 'discipline', 'comp_discipline', 'gender', 'comp_gender', 'country']
+        return [col for col in dict.fromkeys(needed + filter_cols) if col in self._cols]
     
     def get_athlete_stats(self, filters: Dict = None) -> pd.DataFrame:
         """Generate athlete statistics with comprehensive error handling."""
@@ -216,30 +289,28 @@ class ClimbingAnalyzer:
             return pd.DataFrame()
         
         try:
-            df = self.aggregated_df.copy()
+            df = self.aggregated_df[self._stats_columns(['name', 'round_rank', 'year'])]
             if filters:
                 df = self.filter_data(df, filters)
             
-            if df.empty or 'name' not in df.columns:
+            if df.empty or 'name' not in self._cols:
                 return pd.DataFrame()
             
             # Ensure we have required columns
             required_cols = ['name', 'round_rank']
-            missing_cols = [col for col in required_cols if col not in df.columns]
+            missing_cols = [col for col in required_cols if col not in self._cols]
             
             if missing_cols:
                 self.logger.error(f"Missing required columns for athlete stats: {missing_cols}")
                 return pd.DataFrame()
             
-            # Calculate statistics
-            athlete_stats = df.groupby(['name']).agg({
-                'round_rank': [
-                    'count',
-                    'mean', 
-                    lambda x: (x == 1).sum(),  # wins
-                    lambda x: (x <= 3).sum()   # podiums
-                ],
-                'year': ['min', 'max'] if 'year' in df.columns else ['count', 'count']
+            # Calculate statistics; boolean columns keep wins/podiums on the Cython path
+            ranks = df['round_rank']
+            athlete_stats = df.assign(is_win=ranks.eq(1), is_podium=ranks.le(3)).groupby(['name'], observed=True).agg({
+                'round_rank': ['count', 'mean'],
+                'is_win': 'sum',
+                'is_podium': 'sum',
+                'year': ['min', 'max'] if 'year' in self._cols else ['count', 'count']
             }).round(2)
             
             # Flatten column names
@@ -250,11 +321,11 @@ class ClimbingAnalyzer:
             column_mapping = {
                 'round_rank_count': 'total_competitions',
                 'round_rank_mean': 'avg_rank',
-                'round_rank_<lambda_0>': 'wins',
-                'round_rank_<lambda_1>': 'podiums'
+                'is_win_sum': 'wins',
+                'is_podium_sum': 'podiums'
             }
             
-            if 'year' in df.columns:
+            if 'year' in self._cols:
                 column_mapping.update({
                     'year_min': 'career_start',
                     'year_max': 'career_end'
@@ -283,21 +354,20 @@ class ClimbingAnalyzer:
             return pd.DataFrame()
         
         try:
-            df = self.aggregated_df.copy()
+            df = self.aggregated_df[self._stats_columns(['country', 'name', 'round_rank'])]
             if filters:
                 df = self.filter_data(df, filters)
             
-            if df.empty or 'country' not in df.columns:
+            if df.empty or 'country' not in self._cols:
                 return pd.DataFrame()
             
             # Calculate country statistics
-            country_stats = df.groupby('country').agg({
-                'name': 'nunique',
-                'round_rank': [
-                    'count',
-                    lambda x: (x == 1).sum(),  # wins
-                    lambda x: (x <= 3).sum()   # podiums
-                ] if 'round_rank' in df.columns else ['count', 'count', 'count']
+            ranks = df['round_rank']
+            country_stats = df.assign(is_win=ranks.eq(1), is_podium=ranks.le(3)).groupby('country', observed=True).agg({
+                'name': ['nunique'],
+                'round_rank': ['count'],
+                'is_win': ['sum'],
+                'is_podium': ['sum']
             })
             
             # Flatten column names
@@ -308,8 +378,8 @@ class ClimbingAnalyzer:
             country_stats.rename(columns={
                 'name_nunique': 'total_athletes',
                 'round_rank_count': 'total_participations',
-                'round_rank_<lambda_0>': 'total_wins',
-                'round_rank_<lambda_1>': 'total_podiums'
+                'is_win_sum': 'total_wins',
+                'is_podium_sum': 'total_podiums'
             }, inplace=True)
             
             return country_stats.sort_values('total_athletes', ascending=False)
@@ -2,11 +2,48 @@ import pandas as pd
 import numpy as np
 from pathlib import Path
 import re
+import os
+import json
 from datetime import datetime
 import warnings
 import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
-warnings.filterwarnings('ignore')
+# A year's event results batched into one file, named f"{year}{YEAR_RESULTS_SUFFIX}"
+YEAR_RESULTS_SUFFIX = '_all_events.parquet'
+
+# root -> ({directory: mtime_ns}, [(path, relative_path), ...])
+_RESULT_LISTINGS = {}
+
+def _list_result_files(root: Path) -> list:
+    """List (path, relative_path) for every result file under root, reusing the last walk while no directory changed."""
+    root = os.fspath(root)
+    cached = _RESULT_LISTINGS.get(root)
+    if cached is not None:
+        try:
+            if all(os.stat(d).st_mtime_ns == mtime for d, mtime in cached[0].items()):
+                return cached[1]
+        except OSError:
+            pass
+    
+    # One scandir per directory; dirents carry their type, so no per-file stat.
+    # Breadth-first, which matches the order rglob used to return.
+    dir_mtimes = {}
+    files = []
+    pending = deque([(root, '')])
+    while pending:
+        directory, prefix = pending.popleft()
+        dir_mtimes[directory] = os.stat(directory).st_mtime_ns
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append((entry.path, prefix + entry.name + os.sep))
+                elif entry.name.endswith(('.csv', YEAR_RESULTS_SUFFIX)):
+                    files.append((entry.path, prefix + entry.name))
+    
+    _RESULT_LISTINGS[root] = (dir_mtimes, files)
+    return files
 
 class IFSCDataAggregator:
     """Streamlined IFSC climbing competition data aggregator with robust error handling."""
@@ -47,23 +84,47 @@ class IFSCDataAggregator:
         self.logger.info("Loading all result files...")
         
         all_results = []
-        csv_files = list(self.data_dir.rglob("*.csv"))
+        file_names = []
+        file_paths = []
+        result_files = _list_result_files(self.data_dir)
         
         failed_files = []
         
-        for csv_file in csv_files:
-            try:
-                # Read with error handling for encoding issues
-                df = pd.read_csv(csv_file, encoding='utf-8', on_bad_lines='skip')
-                
+        # read_csv releases the GIL while parsing, so threads overlap the reads;
+        # map keeps results in file order
+        max_workers = min(16, (os.cpu_count() or 1) * 2)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            paths = [path for path, _ in result_files]
+            loaded = list(zip(result_files, executor.map(self._read_result_file, paths)))
+        
+        # Events in a yearly batch replace their per-event CSVs
+        superseded = set()
+        for (path, relative_path), (df, error) in loaded:
+            if error is None and path.endswith(YEAR_RESULTS_SUFFIX) and 'source_file' in df.columns:
+                folder = os.path.dirname(relative_path)
+                superseded.update(os.path.join(folder, name) for name in df['source_file'].dropna().unique().tolist())
+        
+        for (path, relative_path), (df, error) in loaded:
+            if error is not None:
+                failed_files.append((os.path.basename(path), error))
+                continue
+            
+            if path.endswith(YEAR_RESULTS_SUFFIX):
+                event_files = self._split_year_results(df, os.path.dirname(relative_path))
+            elif relative_path in superseded:
+                continue
+            else:
+                event_files = [(os.path.basename(path), relative_path, df)]
+            
+            for file_name, file_path, df in event_files:
                 if not df.empty and 'name' in df.columns:
-                    df['_file'] = csv_file.name
-                    df['file_path'] = str(csv_file.relative_to(self.data_dir))
+                    # Tag rows with a small integer id; the file names are
+                    # attached once, as categoricals, after the concat
+                    df['_file_id'] = np.full(len(df), len(file_names), dtype=np.int32)
+                    file_names.append(file_name)
+                    file_paths.append(file_path)
                     all_results.append(df)
-                    
-            except Exception as e:
-                failed_files.append((csv_file.name, str(e)))
-                continue
+        del loaded
         
         if failed_files:
             self.logger.warnsourceing(f"Failed to load {len(failed_files)} files")
@@ -71,9 +132,32 @@ class IFSCDataAggregator:
         if not all_results:
             raise ValueError("No valid result files could be loaded")
         
-        # Combine all results
-        self.results_df = pd.concat(all_results, ignore_index=True, sort=False)
-        self.logger.info(f"Loaded {len(csv_files)} files, {len(self.results_df)} total records")
+        # Combine all results. Shards sharing a column layout are concatenated
+        # first, so the final concat only aligns a few frames; the row offsets
+        # put in the index restore file order afterwards.
+        # Each step drops its inputs once combined, so at most two copies of the
+        # results are alive at a time rather than every stage at once.
+        layouts = {}
+        offset = 0
+        for df in all_results:
+            df.index = pd.RangeIndex(offset, offset + len(df))
+            offset += len(df)
+            layouts.setdefault(tuple(df.columns), []).append(df)
+        all_results.clear()
+        shards = [pd.concat(layouts.pop(columns)) for columns in list(layouts)]
+        combined = pd.concat(shards, sort=False)
+        del shards
+        combined = combined.sort_index().reset_index(drop=True)
+        
+        # Expand the file ids; relative paths are unique, base names may repeat
+        # across year folders so they are factorized first
+        position = combined.columns.get_loc('_file_id')
+        file_ids = combined.pop('_file_id').to_numpy()
+        name_codes, names = pd.factorize(pd.Index(file_names))
+        combined.insert(position, '_file', pd.Categorical.from_codes(name_codes[file_ids], names))
+        combined.insert(position + 1, 'file_path', pd.Categorical.from_codes(file_ids, file_paths))
+        self.results_df = combined
+        self.logger.info(f"Loaded {len(result_files)} files, {len(self.results_df)} total records")
         
         # Process the data
         self._clean_data()
@@ -84,6 +168,27 @@ class IFSCDataAggregator:
         self.results_df.sort_values(by=['start_date'], inplace=True)
         return self.results_df
     
+    def _read_result_file(self, path: str):
+        """Read one result CSV or yearly batch, returning (DataFrame, None) or (None, error)."""
+        try:
+            if path.endswith(YEAR_RESULTS_SUFFIX):
+                return pd.read_parquet(path), None
+            # Read with error handling for encoding issues
+            return pd.read_csv(path, encoding='utf-8', on_bad_lines='skip'), None
+        except Exception as e:
+            return None, str(e)
+    
+    def _split_year_results(self, df: pd.DataFrame, folder: str) -> list:
+        """Split a yearly batch into (file name, relative path, DataFrame) per event file."""
+        if 'source_file' not in df.columns:
+            return []
+        event_files = []
+        for source_file, event_df in df.groupby('source_file', sort=False):
+            # The batch holds every event's columns; keep the ones this event filled
+            event_df = event_df.dropna(axis=1, how='all').reset_index(drop=True)
+            event_files.append((source_file, os.path.join(folder, source_file), event_df))
+        return event_files
+    
     def _clean_data(self):
         """Clean and standardize data with minimal processing."""
         self.logger.info("Cleaning data...")
@@ -106,6 +211,11 @@ class IFSCDataAggregator:
             self.results_df['name'] = self.results_df['name'].astype(str).str.strip().str.title()
             self.results_df = self.results_df[~self.results_df['name'].isin(['', 'nan', 'None'])]
         
+        # Store low-cardinality text as categories
+        for col in ['country', 'discipline', 'gender']:
+            if col in self.results_df.columns:
+                self.results_df[col] = self.results_df[col].astype('category')
+        
         self.results_df['processed_at'] = datetime.now()
         
     # def _extract_metadata(self):
@@ -178,29 +288,37 @@ class IFSCDataAggregator:
     def _classify_scoring_systems(self):
         """Classify records by scoring system era."""
         
-        def get_scoring_era(row):
-            discipline = row['discipline']
-            year = row['year']
-            
-            # Normalize discipline names
-            discipline_map = {
-                'L': 'Lead',    'Lead': 'Lead', 
-                'B': 'Boulder', 'Boulder': 'Boulder',
-                'S': 'Speed',   'Speed': 'Speed'
-            }
-            discipline = discipline_map.get(discipline, discipline)
-            
-            if discipline not in self.scoring_systems:
-                return f'{discipline}_Unknown'
-            
-            # Find matching era
-            for era_name, era_info in self.scoring_systems[discipline].items():
-                if era_info['start'] <= year <= era_info['end']:
-                    return f'{discipline}_{era_name}'
-            
-            return f'{discipline}_Unknown'
-        
-        self.results_df['scoring_era'] = self.results_df.apply(get_scoring_era, axis=1)
+        # Normalize discipline names
+        discipline_map = {
+            'L': 'Lead',    'Lead': 'Lead', 
+            'B': 'Boulder', 'Boulder': 'Boulder',
+            'S': 'Speed',   'Speed': 'Speed'
+        }
+        discipline = self.results_df['discipline'].astype('category')
+        codes = discipline.cat.codes.to_numpy()
+        year = self.results_df['year'].to_numpy(dtype='float64', na_value=np.nan)
+        
+        # Normalize the few categories instead of every row; the extra last
+        # row is what code -1 (missing) picks up
+        names = [discipline_map.get(c, c) for c in discipline.cat.categories] + [np.nan]
+        
+        # Era lookup table: one row per discipline category, one column per year,
+        # plus a last column for years outside every era (or missing)
+        first_year = min(era['start'] for eras in self.scoring_systems.values() for era in eras.values())
+        last_year = max(era['end'] for eras in self.scoring_systems.values() for era in eras.values())
+        span = last_year - first_year + 1
+        label_ids = {}
+        table = np.empty((len(names), span + 1), dtype=np.int16)
+        for row, name in enumerate(names):
+            table[row, :] = label_ids.setdefault(f'{name}_Unknown', len(label_ids))
+            # Fill in reverse so the first matching era wins, as in the era tables
+            for era_name, era_info in reversed(self.scoring_systems.get(name, {}).items()):
+                era_id = label_ids.setdefault(f'{name}_{era_name}', len(label_ids))
+                table[row, era_info['start'] - first_year:era_info['end'] - first_year + 1] = era_id
+        
+        in_range = (year >= first_year) & (year <= last_year)
+        year_col = np.where(in_range, year - first_year, span).astype(np.intp)
+        self.results_df['scoring_era'] = pd.Categorical.from_codes(table[codes, year_col], categories=list(label_ids))
         
        
     # def _save_all_data(self):
@@ -245,16 +363,74 @@ class IFSCDataAggregator:
         if not results_file.exists():
             raise FileNotFoundError(f"Aggregated results not found: {results_file}")
         
-        self.results_df = pd.read_csv(results_file)
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', category=pd.errors.DtypeWarning)
+            self.results_df = pd.read_csv(results_file)
         self.logger.info(f"Loaded existing results: {len(self.results_df)} records")
         return self.results_df
     
+    def save_aggregated_results(self, results_df: pd.DataFrame) -> Path:
+        """Save aggregated results as CSV (for compatibility) and Parquet."""
+        agg_dir = self.output_dir / "aggregate_data"
+        csv_file = agg_dir / "aggregated_results.csv"
+        parquet_file = agg_dir / "aggregated_results.parquet"
+        
+        results_df.to_csv(csv_file, index=False)
+        
+        parquet_df = self._downcast_dtypes(self._parquet_compatible(results_df))
+        parquet_df.to_parquet(parquet_file, index=False, compression='zstd')
+        
+        # Written last so the dashboard can tell it is newer than the CSV
+        overview_file = agg_dir / "overview.json"
+        overview_file.write_text(json.dumps(self.build_overview(results_df), indent=2))
+        
+        self.logger.info(f"Saved aggregated results: {csv_file} ({len(results_df)} records)")
+        return parquet_file
+    
+    def save_parquet(self, df: pd.DataFrame, path: Path):
+        """Save a results table (e.g. an era file) as snappy Parquet."""
+        self._parquet_compatible(df).to_parquet(path, index=False, compression='snappy')
+    
+    def _parquet_compatible(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Store object columns that mix types as strings; Parquet needs one type per column."""
+        # e.g. P1_Top mixes tries and 'X'
+        mixed_cols = {
+            col: 'string' for col in df.select_dtypes(include='object').columns
+            if pd.api.types.infer_dtype(df[col], skipna=True) in ('mixed', 'mixed-integer')
+        }
+        return df.astype(mixed_cols)
+    
+    def _downcast_dtypes(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Shrink numeric columns and store repetitive text columns as categories."""
+        dtypes = {}
+        for col in df.select_dtypes(include='integer').columns:
+            dtypes[col] = pd.to_numeric(df[col], downcast='integer').dtype
+        for col in df.select_dtypes(include='float').columns:
+            dtypes[col] = 'float32'
+        for col in df.select_dtypes(include='object').columns:
+            if df[col].nunique() < 0.5 * len(df):
+                dtypes[col] = 'category'
+        return df.astype(dtypes)
+    
+    def build_overview(self, results_df: pd.DataFrame) -> dict:
+        """Summarize aggregated results for the dashboard overview."""
+        return {
+            'total_records': len(results_df),
+            'unique_athletes': int(results_df['name'].nunique()),
+            'unique_countries': int(results_df['country'].nunique()),
+            'year_range': [int(results_df['year'].min()), int(results_df['year'].max())],
+            'disciplines': {k: int(v) for k, v in results_df['discipline'].value_counts().items()},
+            'genders': {k: int(v) for k, v in results_df['gender'].value_counts().items()},
+        }
+    
     def update_results(self, df_list: list) -> pd.DataFrame: 
         """Update existing results with new data."""
         old_result_file = self.output_dir / "aggregate_data" / "aggregated_results.csv"
         
         if old_result_file.exists():
-            old_result_df = pd.read_csv(old_result_file)
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore', category=pd.errors.DtypeWarning)
+                old_result_df = pd.read_csv(old_result_file)
         else:
             old_result_df = pd.DataFrame()
         
@@ -274,7 +450,7 @@ class IFSCDataAggregator:
             if not old_result_df.empty:
                 combined_df = pd.concat([old_result_df, self.results_df], ignore_index=True, sort=False)
             else:
-                combined_df = self.results_df.copy()
+                combined_df = self.results_df
             
             # Remove duplicates based on key columns if they exist
             if all(col in combined_df.columns for col in ['name', 'year', 'discipline', 'gender']):
@@ -1,10 +1,52 @@
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
 import matplotlib.pyplot as plt
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Optional, Tuple
 import logging
 
+# 10 ** (d / 400) == exp(d * ELO_EXP_SCALE); exp is much cheaper than a general power
+ELO_EXP_SCALE = np.log(10.0) / 400.0
+
+# The only result columns the ELO calculation reads
+LOAD_COLUMNS = {'name', 'country', 'event_name', 'start_date', 'discipline', 'gender', 'round', 'round_rank'}
+
+# ELO history is kept column-wise: one list per column, extended a round at a time,
+# and converted with these dtypes instead of inferring them per value
+HISTORY_DTYPES = {
+    'name': object,
+    'country': object,
+    'event': object,
+    'year': np.int64,
+    'date': 'datetime64[ns]',
+    'discipline': object,
+    'gender': object,
+    'round': object,
+    'rank': np.float64,
+    'elo_before': np.float64,
+    'elo_after': np.float64,
+    'elo_change': np.float64,
+    'competed': bool,
+}
+
+def _elo_changes(ratings: np.ndarray, ranks: np.ndarray, k_factor: float) -> np.ndarray:
+    """Rating change of each athlete in one round, normalized by the number of opponents."""
+    n = len(ratings)
+    
+    # Actual score: 1 per opponent ranked below, 0.5 per tie. Counted from the
+    # sorted ranks, so only the expected scores need an n x n matrix. Both sums
+    # include the athlete against themselves, which adds 0.5 to each and cancels.
+    sorted_ranks = np.sort(ranks)
+    below = np.searchsorted(sorted_ranks, ranks, side='right')
+    tied = below - np.searchsorted(sorted_ranks, ranks, side='left')
+    actual = (n - below) + 0.5 * tied
+    
+    expected = (1.0 / (1.0 + np.exp((ratings[None, :] - ratings[:, None]) * ELO_EXP_SCALE))).sum(axis=1)
+    return k_factor * (actual - expected) / (n - 1)
+
 class ELOCalculator:
     """Optimized ELO rating calculator for climbing competitions."""
     
@@ -14,7 +56,18 @@ class ELOCalculator:
         self.initial_rating = initial_rating
         self.df = None
         self.elo_ratings = {}
-        self.elo_history = []
+        self.elo_history = {col: [] for col in HISTORY_DTYPES}
+        # Bumped whenever the history changes, so callers can tell cached rankings are stale
+        self.version = 0
+        
+        # History as a DataFrame plus factorized filter columns, built on first
+        # use and dropped whenever the history changes
+        self._history_df = None
+        self._history_codes = {}
+        
+        # Ratings while processing rounds, indexed by integer athlete id
+        self._athlete_names = np.empty(0, dtype=object)
+        self._ratings = np.empty(0, dtype=np.float64)
         
         # Round priority for chronological sorting
         self.round_priority = {
@@ -34,17 +87,35 @@ class ELOCalculator:
         
         self.logger.info("Loading competition data...")
         
-        # Load all CSV files except the main aggregated one
-        csv_files = [f for f in self.data_dir.glob("*.csv") if f.name != 'aggregated_results.csv']
+        # Load all era files except the main aggregated one; a Parquet era
+        # file replaces the CSV of the same name
+        era_files = {f.stem: f for f in self.data_dir.glob("*.csv") if f.name != 'aggregated_results.csv'}
+        era_files.update(
+            (f.stem, f) for f in self.data_dir.glob("*.parquet") if not f.name.startswith('aggregated_results.')
+        )
         
-        if not csv_files:
+        if not era_files:
             raise ValueError("No competition data files found")
         
         # Efficient concatenation with error handling
         dfs = []
-        for file in csv_files:
+        for file in era_files.values():
             try:
-                df_temp = pd.read_csv(file, dtype={'round_rank': 'Int64'})  # Handle NaN ranks
+                if file.suffix == '.parquet':
+                    columns = [col for col in pq.read_schema(file).names if col in LOAD_COLUMNS]
+                    df_temp = pd.read_parquet(file, columns=columns)
+                    # Plain values like the CSV path; categorical keys would change the round grouping
+                    df_temp = df_temp.astype({col: object for col in df_temp.select_dtypes('category').columns})
+                    df_temp = df_temp.astype({'round_rank': 'Int64'})
+                else:
+                    # The pyarrow engine needs the column list up front, so take it from the header
+                    header = pd.read_csv(file, nrows=0).columns
+                    df_temp = pd.read_csv(
+                        file,
+                        engine='pyarrow',
+                        usecols=[col for col in header if col in LOAD_COLUMNS],  # skip the per-route score columns
+                        dtype={'round_rank': 'Int64'}  # Handle NaN ranks
+                    )
                 if not df_temp.empty:
                     dfs.append(df_temp)
             except Exception as e:
@@ -62,7 +133,7 @@ class ELOCalculator:
         self.df = self.df.dropna(subset=['start_date'])
         
         # Add sorting column
-        self.df['round_order'] = self.df['round'].map(self.round_priority).fillna(99)
+        self.df['round_order'] = self._round_order(self.df['round'])
         
         # Critical: Sort chronologically for proper ELO calculation
         self.df = self.df.sort_values(
@@ -73,6 +144,12 @@ class ELOCalculator:
         self.logger.info(f"Loaded {len(self.df)} valid competition records")
         return self.df
     
+    def _round_order(self, rounds: pd.Series) -> np.ndarray:
+        """Sort priority of each round; rounds missing from round_priority go last (99)."""
+        codes = pd.Categorical(rounds, categories=list(self.round_priority)).codes
+        # Code -1 (unknown round) picks the trailing 99
+        return np.append(np.fromiter(self.round_priority.values(), dtype=np.int64), 99)[codes]
+    
     def calculate_elo_ratings(self) -> pd.DataFrame:
         """Calculate ELO ratings with proper initialization timing."""
         if self.df is None:
@@ -82,115 +159,202 @@ class ELOCalculator:
         
         # Reset state
         self.elo_ratings.clear()
-        self.elo_history.clear()
+        self._clear_history()
         
-        # Pre-calculate first appearances for efficiency
-        first_appearances = self.df.groupby('name')['start_date'].min()
-        athlete_countries = self.df.groupby('name')['country'].first() if 'country' in self.df.columns else {}
-
         # Process competitions chronologically
-        for group_key, event_data in self.df.groupby(
-            ['event_name', 'start_date', 'discipline', 'gender', 'round'], 
-            sort=False
-        ):
-            event_name, date, discipline, gender, round_type = group_key
-            event_data = event_data.sort_values('round_rank')
-            
-            athletes = event_data['name'].tolist()
-            ranks = event_data['round_rank'].tolist()
-            
-            # Initialize new athletes at their first appearance
-            for athlete in athletes:
-                if athlete not in self.elo_ratings:
-                    self.elo_ratings[athlete] = self.initial_rating
-                    first_date = first_appearances[athlete]
-                    country = athlete_countries.get(athlete, "Unknown")
-                    # Add initial rating record
-                    self.elo_history.append({
-                        'name': athlete,
-                        'country': country,
-                        'event': 'Initial Rating',
-                        'year': first_date.year,
-                        'date': first_date,
-                        'discipline': discipline,
-                        'gender': gender,
-                        'round': 'Initial',
-                        'rank': None,
-                        'elo_before': self.initial_rating,
-                        'elo_after': self.initial_rating,
-                        'elo_change': 0,
-                        'competed': False
-                    })
-            
-            # Calculate ELO changes for this round
-            self._process_round(athletes, ranks, event_name, date, discipline, gender, round_type, athlete_countries)
+        self._run_rounds(self.df)
         
         # Convert to DataFrame and sort properly
-        result = pd.DataFrame(self.elo_history)
+        result = self._history_frame()
         if not result.empty:
             result = result.sort_values(
                 ['date', 'competed', 'name'], 
-                kind='stable'
-            ).reset_index(drop=True)
+                kind='stable',
+                ignore_index=True
+            )
         
         self.logger.info(f"Calculated ELO for {len(self.elo_ratings)} athletes")
         return result
     
-    def _process_round(self, athletes: List[str], ranks: List[int], 
+    def _run_rounds(self, df: pd.DataFrame):
+        """Rate every round of df in order, seeding athletes at their first appearance."""
+        name_ids, rated, first_appearances = self._index_athletes(df)
+        # Each athlete's first listed country, by athlete id
+        if 'country' in df.columns:
+            athlete_countries = (
+                df['country'].groupby(name_ids).first()
+                .reindex(range(len(self._athlete_names))).to_numpy(dtype=object)
+            )
+        else:
+            athlete_countries = np.full(len(self._athlete_names), "Unknown", dtype=object)
+        
+        for event_name, date, discipline, gender, round_type, athlete_ids, ranks, new_ids in self._iter_rounds(df, name_ids, rated):
+            # Initialize new athletes at their first appearance
+            if len(new_ids):
+                rated[new_ids] = True
+                self._seed_athletes(new_ids, first_appearances, discipline, gender, athlete_countries)
+            
+            # Calculate ELO changes for this round
+            self._process_round(athlete_ids, ranks, event_name, date, discipline, gender, round_type, athlete_countries)
+        
+        self.elo_ratings.update(zip(self._athlete_names[rated].tolist(), self._ratings[rated].tolist()))
+    
+    def _index_athletes(self, df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray, pd.DatetimeIndex]:
+        """Give every athlete an integer id and start the ratings array from elo_ratings.
+        
+        Returns the id of each row of df, a mask of athletes that already have a
+        rating, and each athlete's first start_date in df (by id).
+        """
+        known = list(self.elo_ratings)
+        names = pd.Index(known, dtype=object).append(pd.Index(df['name'].unique(), dtype=object)).unique()
+        
+        self._athlete_names = names.to_numpy()
+        self._ratings = np.full(len(names), self.initial_rating, dtype=np.float64)
+        self._ratings[:len(known)] = list(self.elo_ratings.values())
+        rated = np.zeros(len(names), dtype=bool)
+        rated[:len(known)] = True
+        
+        name_ids = names.get_indexer(df['name'])
+        first_appearances = pd.DatetimeIndex(
+            pd.Series(df['start_date'].to_numpy()).groupby(name_ids).min().reindex(range(len(names)))
+        )
+        return name_ids, rated, first_appearances
+    
+    def _iter_rounds(self, df: pd.DataFrame, name_ids: np.ndarray, rated: np.ndarray):
+        """Yield (event, date, discipline, gender, round, athlete_ids, ranks, new_ids) for each round in order.
+        
+        new_ids are the athletes without a rating yet who appear for the first time in that round.
+        """
+        # Number the rounds in order of first appearance (a missing key gives -1
+        # and is skipped, as in groupby), then order the rows by round and rank.
+        # lexsort is stable, so tied ranks keep their original order.
+        round_ids = df.groupby(
+            ['event_name', 'start_date', 'discipline', 'gender', 'round'],
+            sort=False
+        ).ngroup().to_numpy()
+        ranks = df['round_rank'].to_numpy(dtype=np.float64)
+        order = np.lexsort((ranks, round_ids))
+        order = order[round_ids[order] >= 0]
+        if not len(order):
+            return
+        
+        # Each athlete's first row in processing order is where they get seeded
+        row_ids = name_ids[order]
+        seeds = np.zeros(len(order), dtype=bool)
+        seeds[np.unique(row_ids, return_index=True)[1]] = True
+        seeds &= ~rated[row_ids]
+        
+        event_names = df['event_name'].to_numpy()
+        dates = df['start_date'].array
+        disciplines = df['discipline'].to_numpy()
+        genders = df['gender'].to_numpy()
+        round_types = df['round'].to_numpy()
+        
+        bounds = np.flatnonzero(np.diff(round_ids[order])) + 1
+        for rows, athlete_ids, round_seeds in zip(np.split(order, bounds), np.split(row_ids, bounds), np.split(seeds, bounds)):
+            first = rows[0]
+            yield (event_names[first], dates[first], disciplines[first], genders[first], round_types[first],
+                   athlete_ids, ranks[rows], athlete_ids[round_seeds])
+    
+    def _seed_athletes(self, athlete_ids: np.ndarray, first_appearances: pd.DatetimeIndex,
+                       discipline: str, gender: str, athlete_countries: np.ndarray = None):
+        """Add the initial rating records of the given athletes."""
+        athletes = self._athlete_names[athlete_ids].tolist()
+        first_dates = first_appearances[athlete_ids]
+        self._extend_history(
+            len(athletes),
+            name=athletes,
+            country=athlete_countries[athlete_ids].tolist() if athlete_countries is not None else None,
+            event='Initial Rating',
+            year=first_dates.year.tolist(),
+            date=list(first_dates),
+            discipline=discipline,
+            gender=gender,
+            round='Initial',
+            rank=None,
+            elo_before=self.initial_rating,
+            elo_after=self.initial_rating,
+            elo_change=0,
+            competed=False
+        )
+    
+    def _process_round(self, athlete_ids: np.ndarray, ranks: np.ndarray, 
                       event: str, date, discipline: str, gender: str, round_type: str,
-                      athlete_countries: Dict[str, str] = None):
+                      athlete_countries: np.ndarray = None):
         """Process a single competition round efficiently."""
-        n = len(athletes)
+        n = len(athlete_ids)
         if n < 2:
             return  # Skip rounds with insufficient competitors
         
-        # Pre-calculate all ratings for efficiency
-        ratings = [self.elo_ratings[athlete] for athlete in athletes]
-        
-        for i, athlete in enumerate(athletes):
-            rating_before = ratings[i]
-            rank_i = ranks[i]
-            total_change = 0
-            
-            # Compare against all other athletes
-            for j in range(n):
-                if i != j:
-                    rating_j = ratings[j]
-                    rank_j = ranks[j]
-                    
-                    # Expected score based on rating difference
-                    expected = 1 / (1 + 10 ** ((rating_j - rating_before) / 400))
-                    
-                    # Actual score based on ranking
-                    if rank_i < rank_j:
-                        actual = 1.0
-                    elif rank_i > rank_j:
-                        actual = 0.0
-                    else:
-                        actual = 0.5
-                    
-                    # ELO change (normalized by number of opponents)
-                    total_change += self.k_factor * (actual - expected) / (n - 1)
-            
-            # Update rating
-            self.elo_ratings[athlete] += total_change
-            country = athlete_countries.get(athlete, "Unknown")
-            # Record competition
-            self.elo_history.append({
-                'name': athlete,
-                'country': country,
-                'event': event,
-                'year': date.year,
-                'date': date,
-                'discipline': discipline,
-                'gender': gender,
-                'round': round_type,
-                'rank': rank_i,
-                'elo_before': rating_before,
-                'elo_after': self.elo_ratings[athlete],
-                'elo_change': total_change,
-                'competed': True
+        # ELO change for the whole round at once
+        ratings = self._ratings[athlete_ids]
+        changes = _elo_changes(ratings, ranks, self.k_factor)
+        ratings_after = ratings + changes
+        
+        # An athlete listed twice in a round gets both changes, one after the other
+        ids = athlete_ids.tolist()
+        if len(set(ids)) < n:
+            running = {}
+            for i, athlete_id in enumerate(ids):
+                ratings_after[i] = running[athlete_id] = running.get(athlete_id, ratings[i]) + changes[i]
+        
+        # Update ratings (add.at applies every change of a repeated athlete) and record the round
+        np.add.at(self._ratings, athlete_ids, changes)
+        athletes = self._athlete_names[athlete_ids].tolist()
+        self._extend_history(
+            n,
+            name=athletes,
+            country=athlete_countries[athlete_ids].tolist() if athlete_countries is not None else None,
+            event=event,
+            year=date.year,
+            date=date,
+            discipline=discipline,
+            gender=gender,
+            round=round_type,
+            rank=ranks.tolist(),
+            elo_before=ratings.tolist(),
+            elo_after=ratings_after.tolist(),
+            elo_change=changes.tolist(),
+            competed=True
+        )
+    
+    def _extend_history(self, n: int, **columns):
+        """Append n rows to the history; a scalar value is repeated for every row."""
+        for col, values in columns.items():
+            self.elo_history[col].extend(values if isinstance(values, list) else [values] * n)
+        self._history_df = None
+        self.version += 1
+    
+    def _history_frame(self) -> pd.DataFrame:
+        """DataFrame of the history columns, built once per history change."""
+        if self._history_df is None:
+            self._history_df = pd.DataFrame({
+                col: pd.DatetimeIndex(values).to_numpy() if col == 'date' else np.array(values, dtype=HISTORY_DTYPES[col])
+                for col, values in self.elo_history.items()
             })
+            self._history_codes = {}
+        return self._history_df
+    
+    def _history_matches(self, col: str, value: str) -> np.ndarray:
+        """Boolean mask of history rows whose col equals value, ignoring case.
+        
+        The column is factorized once per history change, so each filter only
+        lower-cases the distinct values instead of every row.
+        """
+        history_df = self._history_frame()
+        if col not in self._history_codes:
+            codes, uniques = pd.factorize(history_df[col])
+            self._history_codes[col] = (codes, pd.Index(uniques).str.lower())
+        codes, lowered = self._history_codes[col]
+        # Missing values have code -1, which picks the trailing False
+        return np.append(lowered == value.lower(), False)[codes]
+    
+    def _clear_history(self):
+        """Empty every history column."""
+        for values in self.elo_history.values():
+            values.clear()
+        self._history_df = None
+        self.version += 1
     
     def get_current_rankings(self, discipline: str = None, gender: str = None, 
                            top_n: int = 50) -> pd.DataFrame:
@@ -198,37 +362,32 @@ class ELOCalculator:
         if not self.elo_ratings:
             self.calculate_elo_ratings()
         
-        if not self.elo_history:
+        if not self.elo_history['name']:
             return pd.DataFrame()
         
         # Get competition history
-        history_df = pd.DataFrame(self.elo_history)
-        competition_df = history_df[history_df['competed'] == True]
+        history_df = self._history_frame()
+        mask = history_df['competed'].to_numpy(dtype=bool, copy=True)
         
-        if competition_df.empty:
+        if not mask.any():
             return pd.DataFrame()
         
         # Apply filters
         if discipline:
-            competition_df = competition_df[
-                competition_df['discipline'].str.lower() == discipline.lower()
-            ]
+            mask &= self._history_matches('discipline', discipline)
         if gender:
-            competition_df = competition_df[
-                competition_df['gender'].str.lower() == gender.lower()
-            ]
+            mask &= self._history_matches('gender', gender)
+        competition_df = history_df[mask]
         
         if competition_df.empty:
             return pd.DataFrame()
         
-        # Get latest rating for each athlete
+        # Get latest rating for each athlete; the history is already in
+        # chronological order, so the last row per name is the latest
         latest_ratings = (
-            competition_df.sort_values('date')
-            .groupby('name')
-            .last()[['elo_after']]
-            .reset_index()
+            competition_df.drop_duplicates('name', keep='last')[['name', 'elo_after']]
+            .rename(columns={'elo_after': 'current_elo'})
         )
-        latest_ratings.rename(columns={'elo_after': 'current_elo'}, inplace=True)
         
         # # Calculate additional statistics
         # athlete_stats = competition_df.groupby('name').agg({
@@ -252,19 +411,23 @@ class ELOCalculator:
         # result = latest_ratings.merge(athlete_stats, on='name', how='left')
         # result = result.sort_values('current_elo', ascending=False).head(top_n)
         
-        result = latest_ratings.sort_values('current_elo', ascending=False).head(top_n)
+        # Partition out the top_n ratings and sort only those
+        ratings = latest_ratings['current_elo'].to_numpy()
+        if 0 < top_n < len(ratings):
+            top = np.sort(np.argpartition(-ratings, top_n - 1)[:top_n])
+            result = latest_ratings.iloc[top[np.argsort(-ratings[top], kind='stable')]]
+        else:
+            result = latest_ratings.sort_values('current_elo', ascending=False).head(top_n)
         
         return result.reset_index(drop=True)
     
     def get_athlete_history(self, athlete_name: str) -> pd.DataFrame:
         """Get complete ELO history for a specific athlete."""
-        if not self.elo_history:
+        if not self.elo_history['name']:
             self.calculate_elo_ratings()
         
-        history_df = pd.DataFrame(self.elo_history)
-        athlete_data = history_df[
-            history_df['name'].str.lower() == athlete_name.lower()
-        ]
+        history_df = self._history_frame()
+        athlete_data = history_df[self._history_matches('name', athlete_name)]
         
         return athlete_data.sort_values('date').reset_index(drop=True)
     
@@ -273,11 +436,15 @@ class ELOCalculator:
         output_path = Path(output_dir)
         output_path.mkdir(parents=True, exist_ok=True)
         
-        if not self.elo_history:
+        if not self.elo_history['name']:
             self.calculate_elo_ratings()
         
-        history_df = pd.DataFrame(self.elo_history)
-        history_df.to_csv(output_path / "elo_history.csv", index=False)
+        # Arrow's CSV writer is far faster than to_csv; dates are written as
+        # plain days, matching what to_csv produced
+        table = pa.Table.from_pandas(self._history_frame(), preserve_index=False)
+        date_index = table.schema.get_field_index('date')
+        table = table.set_column(date_index, 'date', table['date'].cast(pa.date32()))
+        pacsv.write_csv(table, output_path / "elo_history.csv")
         
         self.logger.info(f"Saved ELO results to {output_path}")
     
@@ -290,13 +457,13 @@ class ELOCalculator:
             raise FileNotFoundError(f"ELO history file not found: {history_file}")
         
         history_df = pd.read_csv(history_file)
-        self.elo_history = history_df.to_dict('records')
+        self.elo_history = {col: history_df[col].tolist() for col in HISTORY_DTYPES}
+        self._history_df = None
+        self.version += 1
         
-        # Rebuild current ratings from history
-        self.elo_ratings.clear()
-        for record in self.elo_history:
-            if record['competed']:
-                self.elo_ratings[record['name']] = record['elo_after']
+        # Rebuild current ratings from history: each athlete's last competed row
+        latest = history_df[history_df['competed'].astype(bool)].drop_duplicates('name', keep='last')
+        self.elo_ratings = dict(zip(latest['name'].tolist(), latest['elo_after'].tolist()))
     
     def update_elo_ratings(self, new_data: pd.DataFrame) -> pd.DataFrame:
         """Update ELO ratings with new competition data."""
@@ -309,14 +476,14 @@ class ELOCalculator:
         except FileNotFoundError:
             self.logger.info("No existing ELO data found, starting fresh")
             self.elo_ratings.clear()
-            self.elo_history.clear()
+            self._clear_history()
         
         # Prepare new data
         new_data = new_data.dropna(subset=['round_rank', 'name'])
         new_data = new_data[new_data['name'].str.strip() != '']
         new_data['start_date'] = pd.to_datetime(new_data['start_date'], errors='coerce')
         new_data = new_data.dropna(subset=['start_date'])
-        new_data['round_order'] = new_data['round'].map(self.round_priority).fillna(99)
+        new_data['round_order'] = self._round_order(new_data['round'])
         
         # Sort new data chronologically
         new_data = new_data.sort_values(
@@ -326,53 +493,19 @@ class ELOCalculator:
         
         if new_data.empty:
             self.logger.warning("No valid new competition data to process")
-            return pd.DataFrame(self.elo_history)
-        
-        # Find athletes' first appearances in new data for initialization
-        first_appearances = new_data.groupby('name')['start_date'].min()
+            return self._history_frame().copy()
         
         # Process new competitions chronologically
-        for group_key, event_data in new_data.groupby(
-            ['event_name', 'start_date', 'discipline', 'gender', 'round'], 
-            sort=False
-        ):
-            event_name, date, discipline, gender, round_type = group_key
-            event_data = event_data.sort_values('round_rank')
-            
-            athletes = event_data['name'].tolist()
-            ranks = event_data['round_rank'].tolist()
-            
-            # Initialize new athletes
-            for athlete in athletes:
-                if athlete not in self.elo_ratings:
-                    self.elo_ratings[athlete] = self.initial_rating
-                    first_date = first_appearances[athlete]
-                    
-                    self.elo_history.append({
-                        'name': athlete,
-                        'event': 'Initial Rating',
-                        'year': first_date.year,
-                        'date': first_date,
-                        'discipline': discipline,
-                        'gender': gender,
-                        'round': 'Initial',
-                        'rank': None,
-                        'elo_before': self.initial_rating,
-                        'elo_after': self.initial_rating,
-                        'elo_change': 0,
-                        'competed': False
-                    })
-            
-            # Calculate ELO changes for this round
-            self._process_round(athletes, ranks, event_name, date, discipline, gender, round_type)
+        self._run_rounds(new_data)
         
         # Convert to DataFrame and sort
-        result = pd.DataFrame(self.elo_history)
+        result = self._history_frame()
         if not result.empty:
             result = result.sort_values(
                 ['date', 'competed', 'name'], 
-                kind='stable'
-            ).reset_index(drop=True)
+                kind='stable',
+                ignore_index=True
+            )
         
         # Save updated results
         self.save_results()
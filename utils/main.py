@@ -1,30 +1,56 @@
+import numpy as np
 import pandas as pd
+import os
+import hashlib
 import time
 from pathlib import Path
 from datetime import datetime
-# from .scraper_init import IFSCScraper
-# from .data_aggregator import IFSCDataAggregator
-# from .elo_scoring import ELOCalculator
+from concurrent.futures import ThreadPoolExecutor
 
-from scraper_init import IFSCScraper
-from data_aggregator import IFSCDataAggregator
-from elo_scoring import ELOCalculator
+# Package imports under `python -m utils.main`, flat ones under `python utils/main.py`
+try:
+    from .scraper_init import IFSCScraper
+    from .data_aggregator import IFSCDataAggregator, YEAR_RESULTS_SUFFIX
+    from .elo_scoring import ELOCalculator, LOAD_COLUMNS
+except ImportError:
+    from scraper_init import IFSCScraper
+    from data_aggregator import IFSCDataAggregator, YEAR_RESULTS_SUFFIX
+    from elo_scoring import ELOCalculator, LOAD_COLUMNS
 import logging
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
+# Connection-pool chatter from requests' transport; warnings still show
+logging.getLogger('urllib3').setLevel(logging.WARNING)
+
+# Result requests in flight at once; each still waits the scraper's rate limit
+SCRAPE_WORKERS = 4
+
+# Seconds a saved league/event listing is reused instead of scraped again
+LISTING_TTL = 60 * 60
+
+# Disk cache of API responses that never change (event locations, past seasons' results)
+API_CACHE_FILE = Path('IFSC_Data') / 'api_cache.sqlite'
+
+# Rankings kept by get_elo_summary before the cache is emptied
+RANKINGS_CACHE_SIZE = 32
 
 class IFSCDataManager:
     """Main orchestrator for IFSC data scraping and aggregation."""
     
-    def __init__(self):
-        self.scraper = IFSCScraper()
+    def __init__(self, listing_ttl: float = LISTING_TTL, api_cache: Path = API_CACHE_FILE):
+        self.scraper = IFSCScraper(cache_path=api_cache)  # None scrapes every response again
         self.aggregator = IFSCDataAggregator()
         self.elo_calculator = ELOCalculator()
         self.data_dir = Path('IFSC_Data')
         self.leagues_file = self.data_dir / 'all_years_leagues.csv'
+        # Digest of the leagues listing as of the last completed initial fetch
+        self.leagues_digest_file = self.data_dir / '.leagues.blake2b'
         self.metadata_dir = self.data_dir / 'API_Event_metadata'
         self.results_dir = self.data_dir / 'API_Results_Expanded'
+        self.listing_ttl = listing_ttl  # 0 always scrapes listings again
+        # (discipline, gender, top_n, ELO version) -> rankings
+        self._rankings_cache = {}
         
         # Ensure directories exist
         self.metadata_dir.mkdir(parents=True, exist_ok=True)
@@ -32,58 +58,96 @@ class IFSCDataManager:
         Path('Data/aggregate_data').mkdir(parents=True, exist_ok=True)
         Path('Elo_Data').mkdir(parents=True, exist_ok=True)
     
-    def process_events_for_year(self, year: int, league_url: str) -> list:
+    def process_events_for_year(self, year: int, league_url: str, reuse_listing: bool = True) -> list:
         """Process all events for a given year and return list of result DataFrames."""
-        logger.info(f"Processing events for {year}...")
+        logger.info("Processing events for %s...", year)
         
-        # Get events metadata
-        events_df = self.scraper.get_events_from_league(league_url)
+        # Get events metadata, reusing a recently saved listing
+        meta_file = self.metadata_dir / f"{year}_event_meta.csv"
+        events_df = self._saved_listing(meta_file) if reuse_listing else None
+        reused = events_df is not None
+        if not reused:
+            events_df = self.scraper.get_events_from_league(league_url)
         if events_df.empty:
-            logger.warning(f"No events found for {year}")
+            logger.warning("No events found for %s", year)
             return []
         
-        # Save events metadata
-        events_df.to_csv(self.metadata_dir / f"{year}_event_meta.csv", index=False)
-        
         # Process each event's results
         year_dir = self.results_dir / str(year)
         year_dir.mkdir(exist_ok=True)
         
+        columns = events_df.columns.tolist()
+        events = [dict(zip(columns, values)) for values in events_df.itertuples(index=False, name=None)]
+        
+        # Scraping is network-bound, so fetch several rounds at once; results
+        # are handled in event order as they complete
         result_dfs = []
-        for _, event in events_df.iterrows():
+        with ThreadPoolExecutor(max_workers=SCRAPE_WORKERS) as executor:
+            futures = [executor.submit(self.scraper.parse_round_result, event) for event in events]
+            for event, future in zip(events, futures):
+                try:
+                    df, filename = future.result()
+                    if not df.empty:
+                        # Add source_file column that aggregator expects
+                        df['source_file'] = filename
+                        result_dfs.append(df)
+                except Exception as e:
+                    logger.error("Failed to process event %s: %s", event.get('event_name', 'Unknown'), e)
+                    continue
+        
+        # One Parquet file per year instead of a small CSV per event
+        if result_dfs:
+            self._save_year_results(year_dir / f"{year}{YEAR_RESULTS_SUFFIX}", result_dfs)
+        
+        # Save events metadata once its events are processed, replacing the old
+        # file atomically so an interrupted run never leaves a partial listing
+        if not reused:
+            tmp_file = meta_file.with_name(meta_file.name + '.tmp')
             try:
-                df, filename = self.scraper.parse_round_result(event.to_dict())
-                if not df.empty:
-                    # Add source_file column that aggregator expects
-                    df['source_file'] = filename
-                    df.to_csv(year_dir / filename, index=False)
-                    result_dfs.append(df)
-            except Exception as e:
-                logger.error(f"Failed to process event {event.get('event_name', 'Unknown')}: {e}")
-                continue
+                events_df.to_csv(tmp_file, index=False)
+                os.replace(tmp_file, meta_file)
+            finally:
+                tmp_file.unlink(missing_ok=True)
         
-        logger.info(f"Processed {len(result_dfs)} events for {year}")
+        logger.info("Processed %d events for %s", len(result_dfs), year)
         return result_dfs
     
-    def initial_data_fetch(self, test_mode: bool = False):
+    def initial_data_fetch(self, test_mode: bool = False, skip_unchanged: bool = False):
         """Perform initial data scraping and aggregation."""
         logger.info("Starting initial data fetch...")
         start_time = time.time()
         
-        # Get all leagues
-        leagues_df = self.scraper.get_worldcup_leagues()
-        leagues_df.to_csv(self.leagues_file, index=False)
+        # Get all leagues, reusing a recently saved listing
+        leagues_df = self._saved_listing(self.leagues_file)
+        if leagues_df is None:
+            leagues_df = self.scraper.get_worldcup_leagues()
+            leagues_df.to_csv(self.leagues_file, index=False)
+        
+        # If the listing is the one a previous fetch completed, years with saved
+        # results are kept; the latest year is still scraped for new events
+        leagues_digest = hashlib.blake2b(leagues_df.to_csv(index=False).encode()).hexdigest()
+        unchanged = (
+            skip_unchanged and self.leagues_digest_file.exists()
+            and self.leagues_digest_file.read_text() == leagues_digest
+        )
+        latest_year = leagues_df['year'].max()
         
         # Process leagues (limit to 1 for testing)
         leagues_to_process = leagues_df.head(1) if test_mode else leagues_df
         
-        for _, league in leagues_to_process.iterrows():
-            self.process_events_for_year(league['year'], league['url'])
+        for year, url in zip(leagues_to_process['year'].tolist(), leagues_to_process['url'].tolist()):
+            if unchanged and year != latest_year and self._has_results(year):
+                logger.info("Skipping %s: leagues unchanged and results already saved", year)
+                continue
+            self.process_events_for_year(year, url)
+        
+        if not test_mode:
+            self.leagues_digest_file.write_text(leagues_digest)
         
         # Aggregate all results
         logger.info("Aggregating all results...")
         results_df = self.aggregator.aggregate_all_results()
-        results_df.to_csv("Data/aggregate_data/aggregated_results.csv", index=False)
+        self.aggregator.save_aggregated_results(results_df)
         
         # Save era-specific files
         self._save_era_files(results_df)
@@ -94,7 +158,7 @@ class IFSCDataManager:
         self.elo_calculator.save_results()
         
         elapsed = (time.time() - start_time) / 60
-        logger.info(f"Initial fetch completed in {elapsed:.1f} minutes")
+        logger.info("Initial fetch completed in %.1f minutes", elapsed)
     
     def update_existing_data(self):
         """Update existing data with new events."""
@@ -105,29 +169,38 @@ class IFSCDataManager:
             logger.error("No existing leagues file found. Run initial fetch first.")
             return
         
-        df_old_leagues = pd.read_csv(self.leagues_file)
+        # Only the saved years are compared against the fresh listing
+        df_old_leagues = pd.read_csv(self.leagues_file, usecols=['year'], dtype={'year': 'int64'})
+        # Updates always scrape listings; a reused one would hide new seasons and events
         df_new_leagues = self.scraper.get_worldcup_leagues()
         
-        old_years = set(df_old_leagues['year'].tolist())
-        new_years = set(df_new_leagues['year'].tolist())
+        old_years = df_old_leagues['year'].to_numpy()
+        new_years = df_new_leagues['year'].to_numpy()
+        # Sorted, deduplicated year differences in both directions
+        added_years = np.setdiff1d(new_years, old_years)
+        removed_years = np.setdiff1d(old_years, new_years)
+        
+        # League url by year, built once; the first league listed for a year wins
+        first_leagues = df_new_leagues.drop_duplicates('year')
+        url_by_year = dict(zip(first_leagues['year'].tolist(), first_leagues['url'].tolist()))
         
-        if new_years == old_years:
+        if added_years.size == 0 and removed_years.size == 0:
             # Check latest year for new events
-            latest_year = max(old_years)
-            logger.info(f"Updating events for latest year: {latest_year}")
+            latest_year = old_years.max().item()
+            logger.info("Updating events for latest year: %s", latest_year)
             
-            league_row = df_new_leagues[df_new_leagues['year'] == latest_year].iloc[0]
-            new_result_dfs = self.process_events_for_year(latest_year, league_row['url'])
+            new_result_dfs = self.process_events_for_year(
+                latest_year, url_by_year[latest_year], reuse_listing=False
+            )
             
         else:
             # Process new years
-            years_to_process = new_years - old_years
-            logger.info(f"Processing new years: {sorted(years_to_process)}")
+            years_to_process = added_years.tolist()
+            logger.info("Processing new years: %s", years_to_process)
             
             new_result_dfs = []
-            for year in sorted(years_to_process):
-                league_row = df_new_leagues[df_new_leagues['year'] == year].iloc[0]
-                year_results = self.process_events_for_year(year, league_row['url'])
+            for year in years_to_process:
+                year_results = self.process_events_for_year(year, url_by_year[year], reuse_listing=False)
                 new_result_dfs.extend(year_results)
             
             # Update leagues file
@@ -137,70 +210,138 @@ class IFSCDataManager:
         if new_result_dfs:
             logger.info("Updating aggregated results...")
             updated_results = self.aggregator.update_results(new_result_dfs)
-            updated_results.to_csv("Data/aggregate_data/aggregated_results.csv", index=False)
-            self._save_era_files(updated_results)
+            self.aggregator.save_aggregated_results(updated_results)
+            # Updates only replace rows within the scraped years, so only the
+            # era files holding those years change
+            scraped_years = set().union(*(df['year'].unique().tolist() for df in new_result_dfs))
+            self._save_era_files(updated_results, years=scraped_years)
             
             # Update ELO ratings with new data
             logger.info("Updating ELO ratings...")
-            new_data_combined = pd.concat(new_result_dfs, ignore_index=True)
+            # Only the columns the ELO calculation reads, not every score column
+            new_data_combined = pd.concat(
+                [df[df.columns.intersection(LOAD_COLUMNS, sort=False)] for df in new_result_dfs],
+                ignore_index=True
+            )
             self.elo_calculator.update_elo_ratings(new_data_combined)
         else:
             logger.info("No new data to update")
     
-    def _save_era_files(self, results_df: pd.DataFrame):
-        """Save era and gender specific files."""
+    def _save_year_results(self, year_file: Path, result_dfs: list):
+        """Save a year's event results as one Parquet file, keeping saved events not scraped this time."""
+        batch = pd.concat(result_dfs, ignore_index=True, sort=False)
+        if year_file.exists():
+            saved = pd.read_parquet(year_file)
+            saved = saved[~saved['source_file'].isin(batch['source_file'].unique())]
+            if not saved.empty:
+                batch = pd.concat([saved, batch], ignore_index=True, sort=False)
+        self.aggregator.save_parquet(batch, year_file)
+    
+    def _has_results(self, year) -> bool:
+        """Whether any results are saved for year."""
+        year_dir = self.results_dir / str(year)
+        return year_dir.is_dir() and any(year_dir.iterdir())
+    
+    def _saved_listing(self, path: Path):
+        """Return the listing saved at path if it is younger than listing_ttl, else None."""
+        if self.listing_ttl <= 0:
+            return None
+        try:
+            if time.time() - path.stat().st_mtime >= self.listing_ttl:
+                return None
+        except FileNotFoundError:
+            return None
+        logger.info("Reusing listing saved in %s", path)
+        listing = pd.read_csv(path)
+        # Missing urls read back as NaN, which is truthy; scraped listings hold None
+        missing = listing.columns[listing.isna().any()]
+        listing[missing] = listing[missing].astype(object).where(listing[missing].notna(), None)
+        return listing
+    
+    def _save_era_files(self, results_df: pd.DataFrame, years: set = None):
+        """Save era and gender specific files; with years, only those holding rows from these years."""
         raw_data_dir = Path("Data/aggregate_data")
         
-        # Filter out unknown eras
-        valid_df = results_df[~results_df['scoring_era'].str.contains('Unknown', na=False)]
+        # Filter out unknown eras, checking each distinct era label once
+        eras = results_df['scoring_era'].astype('category')
+        unknown_eras = [era for era in eras.cat.categories if 'Unknown' in era]
+        valid_df = results_df[~eras.isin(unknown_eras)]
         
         if valid_df.empty:
             logger.warning("No valid scoring era data to save")
             return
         
-        for (era, gender), group_df in valid_df.groupby(['scoring_era', 'gender']):
-            if len(group_df) < 10:  # Skip small datasets
-                continue
-            
-            filename = f"{era}_{gender}.csv"
-            filepath = raw_data_dir / filename
-            group_df.to_csv(filepath, index=False)
-            logger.info(f"Saved {len(group_df)} records to {filename}")
+        if years is not None:
+            changed = valid_df.loc[valid_df['year'].isin(list(years)), ['scoring_era', 'gender']]
+            changed_files = set(zip(changed['scoring_era'].tolist(), changed['gender'].tolist()))
+        
+        era_groups = [
+            (f"{era}_{gender}.parquet", group_df)
+            for (era, gender), group_df in valid_df.groupby(['scoring_era', 'gender'], observed=True)
+            if len(group_df) >= 10  # Skip small datasets
+            and (years is None or (era, gender) in changed_files)
+        ]
+        
+        # The files are independent and Parquet encoding releases the GIL,
+        # so write them in parallel
+        max_workers = min(16, (os.cpu_count() or 1) * 2)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            list(executor.map(
+                lambda item: self.aggregator.save_parquet(item[1], raw_data_dir / item[0]), era_groups
+            ))
+        
+        for filename, group_df in era_groups:
+            logger.info("Saved %d records to %s", len(group_df), filename)
     
     def get_elo_summary(self, discipline: str = "Boulder", gender: str = "Men", top_n: int = 10):
         """Display current ELO rankings summary."""
         try:
-            rankings = self.elo_calculator.get_current_rankings(
-                discipline=discipline, gender=gender, top_n=top_n
-            )
+            rankings = self._rankings_cache.get((discipline, gender, top_n, self.elo_calculator.version))
+            if rankings is None:
+                rankings = self.elo_calculator.get_current_rankings(
+                    discipline=discipline, gender=gender, top_n=top_n
+                )
+                # Entries from older ELO versions can no longer be hit
+                if len(self._rankings_cache) >= RANKINGS_CACHE_SIZE:
+                    self._rankings_cache.clear()
+                # Keyed on the version after the call, which may have calculated the ratings
+                self._rankings_cache[(discipline, gender, top_n, self.elo_calculator.version)] = rankings
             if not rankings.empty:
-                logger.info(f"\nTop {top_n} {discipline} {gender} ELO Rankings:")
-                for i, row in rankings.head(top_n).iterrows():
-                    logger.info(f"{i+1:2d}. {row['name']:<25} {row['current_elo']:>4.0f}")
+                top = rankings.head(top_n)
+                lines = "\n".join(
+                    f"{i:2d}. {name:<25} {elo:>4.0f}"
+                    for i, (name, elo) in enumerate(zip(top['name'].tolist(), top['current_elo'].tolist()), 1)
+                )
+                # One log record for the whole table
+                logger.info("\nTop %d %s %s ELO Rankings:\n%s", top_n, discipline, gender, lines)
             else:
-                logger.warning(f"No rankings found for {discipline} {gender}")
+                logger.warning("No rankings found for %s %s", discipline, gender)
         except Exception as e:
-            logger.error(f"Failed to get ELO summary: {e}")
+            logger.error("Failed to get ELO summary: %s", e)
 
 def main():
     """Main execution function."""
-    manager = IFSCDataManager()
-    
     # Configuration
     FORCE_INITIAL_FETCH = True  # Set to True to force complete re-scraping
     TEST_MODE = False  # Set to True to limit processing for testing
+    REUSE_LISTINGS = True  # Set to False to scrape league/event listings even if saved within LISTING_TTL
+    SKIP_UNCHANGED_YEARS = True  # Keep saved years when the leagues listing matches the last completed fetch
+    
+    manager = IFSCDataManager(listing_ttl=LISTING_TTL if REUSE_LISTINGS else 0)
     
     try:
         if FORCE_INITIAL_FETCH or not manager.leagues_file.exists():
-            manager.initial_data_fetch(test_mode=TEST_MODE)
+            manager.initial_data_fetch(test_mode=TEST_MODE, skip_unchanged=SKIP_UNCHANGED_YEARS)
         else:
             manager.update_existing_data()
             
         logger.info("Data processing completed successfully")
         
     except Exception as e:
-        logger.error(f"Data processing failed: {e}")
+        logger.error("Data processing failed: %s", e)
         raise
+    finally:
+        manager.scraper.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
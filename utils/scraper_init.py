@@ -1,19 +1,82 @@
 import os
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
 import re
+try:
+    import orjson as fast_json  # Faster API payload parsing when installed
+except ImportError:
+    fast_json = json
 import pandas as pd
 import logging
 from typing import Dict, List
 from dotenv import load_dotenv
 from pathlib import Path
+from functools import lru_cache
+from datetime import datetime
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+import threading
 import time
 
 load_dotenv()
 
+# Keep-alive connections kept to the API host; at least the number of
+# requests the data manager has in flight at once
+HTTP_POOL_SIZE = 16
+
+# Event detail requests in flight at once while listing a league; each still
+# waits the rate limit
+LISTING_WORKERS = 4
+
+# Request delay bounds: backed-off delays double up to MAX_DELAY and shrink by
+# DELAY_STEP per successful request, never below the configured rate_limit
+MAX_DELAY = 30.0
+DELAY_STEP = 0.1
+
+# Location patterns: pre-1998 event names ("... - Place 1995") and API location labels
+LOCATION_IN_NAME = re.compile(r'-(.*?)\d')
+LOCATION_NOISE = re.compile(r'(WCH|WC|Wc|\d+)')
+
+# Column order of an event listing; pre-2007 listings have no round columns
+EVENT_COLUMNS = ['event_name', 'event_id', 'year', 'location', 'discipline',
+                 'gender', 'round', 'start_date', 'category_round_results', 'event_results']
+
+def _header_number(value) -> float:
+    """Non-negative numeric header value; 0.0 when missing or not a number (e.g. an HTTP date)."""
+    try:
+        return max(float(value), 0.0)
+    except (TypeError, ValueError):
+        return 0.0
+
+@lru_cache(maxsize=1)
+def _load_headers() -> Dict:
+    """Request headers from the IFSC_HEADERS JSON environment variable."""
+    headers_env = os.getenv("IFSC_HEADERS", "{}")
+    try:
+        return fast_json.loads(headers_env) if headers_env != "{}" else {}
+    except json.JSONDecodeError:  # orjson's error subclasses it
+        return {}
+
+@lru_cache(maxsize=1)
+def _load_cookies() -> Dict:
+    """Cookies from the COOKIES_STRING environment variable ("key=value; key=value")."""
+    cookies = {}
+    cookies_string = os.getenv("COOKIES_STRING", "")
+    if cookies_string:
+        for part in cookies_string.split("; "):
+            if "=" in part:
+                key, value = part.split("=", 1)
+                cookies[key] = value
+    return cookies
+
 class IFSCScraper:
-    def __init__(self, log_level: str = "INFO", rate_limit: float = 0.5):
+    def __init__(self, log_level: str = "INFO", rate_limit: float = 0.5, cache_path: str = None):
         self.rate_limit = rate_limit
+        # Current delay before each request, adapted to the server's responses
+        self._delay = rate_limit
+        self._delay_lock = threading.Lock()
 
         # --- Setup logging ---
         self.logger = logging.getLogger(self.__class__.__name__)
@@ -24,27 +87,32 @@ class IFSCScraper:
             console_handler.setFormatter(formatter)
             self.logger.addHandler(console_handler)
 
-        # --- Load config from environment ---
-        headers_env = os.getenv("IFSC_HEADERS", "{}")
-        cookies_string = os.getenv("COOKIES_STRING", "")
+        # --- Load config from environment (parsed once per process) ---
+        self.HEADERS = dict(_load_headers())
+        self.COOKIES = dict(_load_cookies())
 
-        try:
-            self.HEADERS = json.loads(headers_env) if headers_env != "{}" else {}
-        except json.JSONDecodeError:
-            self.HEADERS = {}
+        self.BASE_API = "https://ifsc.results.info/"
 
-        self.COOKIES = {}
-        if cookies_string:
-            for part in cookies_string.split("; "):
-                if "=" in part:
-                    key, value = part.split("=", 1)
-                    self.COOKIES[key] = value
+        # --- One pooled session, so requests reuse open connections ---
+        self.session = requests.Session()
+        self.session.headers.update(self.HEADERS)
+        self.session.cookies.update(self.COOKIES)
+        # Transient failures are retried with backoff, honoring Retry-After; the
+        # last response is returned rather than raised so its delay still adapts
+        retries = Retry(
+            total=3, backoff_factor=0.5, status_forcelist=[429, 502, 503, 504],
+            allowed_methods=["GET"], raise_on_status=False
+        )
+        self.session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=HTTP_POOL_SIZE, max_retries=retries))
 
-        self.BASE_API = "https://ifsc.results.info/"
+        # --- Optional on-disk cache of responses that never change ---
+        self._cache = None
+        self._cache_lock = threading.Lock()
+        if cache_path:
+            Path(cache_path).parent.mkdir(parents=True, exist_ok=True)
+            self._cache = sqlite3.connect(cache_path, check_same_thread=False)
+            self._cache.execute("CREATE TABLE IF NOT EXISTS responses (url TEXT PRIMARY KEY, body BLOB)")
 
-        # --- Create data directories ---
-        Path('IFSC_Data/API_Event_metadata').mkdir(parents=True, exist_ok=True)
-        Path('IFSC_Data/API_Results_Expanded').mkdir(parents=True, exist_ok=True)
     # def __init__(self, log_level: str = "INFO", rate_limit: float = 0.5):
     #     self.rate_limit = rate_limit
     #     self._setup_logging(log_level)
@@ -83,19 +151,63 @@ class IFSCScraper:
         
     #     self.BASE_API = "https://ifsc.results.info/"
 
-    def get_api_data(self, endpoint: str = "") -> Dict:
+    def get_api_data(self, endpoint: str = "", cache: bool = False) -> Dict:
+        """Fetch an API endpoint; with cache, a response saved in the disk cache is reused."""
         url = endpoint if endpoint.startswith("http") else self.BASE_API + endpoint.lstrip("/")
+        cache = cache and self._cache is not None
         
         try:
-            time.sleep(self.rate_limit)
-            response = requests.get(url, headers=self.HEADERS, cookies=self.COOKIES, timeout=30)
+            if cache:
+                with self._cache_lock:
+                    row = self._cache.execute("SELECT body FROM responses WHERE url = ?", (url,)).fetchone()
+                if row is not None:
+                    return fast_json.loads(row[0])
+            
+            time.sleep(self._delay)
+            response = self.session.get(url, timeout=30)
+            self._adapt_delay(response)
             response.raise_for_status()
-            return response.json() if response.text else {}
+            if not response.content:
+                return {}
+            # Parse the raw bytes; no decoded text copy of the body
+            data = fast_json.loads(response.content)
+            if cache and data:
+                with self._cache_lock, self._cache:
+                    self._cache.execute("INSERT OR REPLACE INTO responses VALUES (?, ?)", (url, response.content))
+            return data
             
         except Exception as e:
             self.logger.error(f"API request failed for {url}: {e}")
             return {}
 
+    def _adapt_delay(self, response):
+        """Back off on throttled responses and ease back toward rate_limit on success."""
+        headers = response.headers
+        wait = 0.0
+        with self._delay_lock:
+            if response.status_code in (429, 503):
+                self._delay = min(MAX_DELAY, max(self._delay * 2, DELAY_STEP))
+                wait = _header_number(headers.get('Retry-After'))
+            else:
+                self._delay = max(self.rate_limit, self._delay - DELAY_STEP)
+        
+        # Wait out the window once less than a tenth of the quota is left
+        remaining = headers.get('X-RateLimit-Remaining')
+        limit = _header_number(headers.get('X-RateLimit-Limit'))
+        if remaining is not None and limit and _header_number(remaining) < limit / 10:
+            wait = max(wait, _header_number(headers.get('X-RateLimit-Reset')))
+        
+        if wait > 0:
+            self.logger.warning(f"Rate limited by {response.url}, waiting {min(wait, MAX_DELAY):.1f}s")
+            time.sleep(min(wait, MAX_DELAY))
+
+    def close(self):
+        """Close the pooled HTTP connections and the response cache."""
+        self.session.close()
+        if self._cache is not None:
+            self._cache.close()
+            self._cache = None
+
     def get_worldcup_leagues(self) -> pd.DataFrame:
         self.logger.info("Fetching World Cup leagues...")
         
@@ -123,18 +235,18 @@ class IFSCScraper:
 
     def _clean_location(self, event_name: str, year: int, event_url: str) -> str:
         if 1990 < year <= 1997:
-            match = re.search(r'-(.*?)\d', event_name)
+            match = LOCATION_IN_NAME.search(event_name)
             return match.group(1).strip() if match else event_name
         elif 1998 <= year <= 2008:
             parts = event_name.split('-')
             return parts[1].split('(')[0].strip() if len(parts) > 1 else event_name
         else:
-            # Fetch from API or fallback to parsing
-            event_data = self.get_api_data(event_url)
+            # Fetch from API or fallback to parsing; an event's location never changes
+            event_data = self.get_api_data(event_url, cache=True)
             location = event_data.get('location', '')
             
             if location:
-                cleaned = re.sub(r'(WCH|WC|Wc|\d+)', '', location).strip()
+                cleaned = LOCATION_NOISE.sub('', location).strip()
                 if cleaned:
                     return cleaned
             
@@ -184,7 +296,16 @@ class IFSCScraper:
         year = int(data.get('season', 0))
         all_events = []
         
-        for event in data.get('events', []):
+        # Since 2009 each location is an API request of its own, so look them
+        # up concurrently; map keeps the event order
+        events = data.get('events', [])
+        with ThreadPoolExecutor(max_workers=LISTING_WORKERS) as executor:
+            locations = list(executor.map(
+                lambda event: self._clean_location(event.get('event', ''), year, event.get('url', '')),
+                events
+            ))
+        
+        for event, location in zip(events, locations):
             base_event_data = {
                 "event_name": event.get('event', ''),
                 "event_id": event.get('event_id'),
@@ -192,10 +313,7 @@ class IFSCScraper:
                 "start_date": event.get('local_start_date', ''),
                 "event_results": event.get('result_url'),
             }
-            
-            base_event_data['location'] = self._clean_location(
-                base_event_data['event_name'], year, event.get('url', '')
-            )
+            base_event_data['location'] = location
             
             all_events.extend(self._process_disciplines(event, base_event_data))
         
@@ -203,9 +321,7 @@ class IFSCScraper:
             return pd.DataFrame()
         
         df = pd.DataFrame(all_events)
-        column_order = ['event_name', 'event_id', 'year', 'location', 'discipline', 
-                       'gender', 'round', 'start_date', 'category_round_results', 'event_results']
-        df = df[[col for col in column_order if col in df.columns]]
+        df = df[[col for col in EVENT_COLUMNS if col in df.columns]]
         
         filename = f"IFSC_Data/API_Event_metadata/{year}_event_meta.csv"
         # df.to_csv(filename, index=False)
@@ -213,24 +329,31 @@ class IFSCScraper:
         return df
 
     def _create_base_row(self, athlete: Dict, event_meta: Dict) -> Dict:
+        get = athlete.get
+        rank = get('rank')
+        score = get('score')
         base_row = {
-            "name": athlete.get('name', ''),
-            "country": athlete.get('country', ''),
-            "round_rank": int(athlete['rank']) if athlete.get('rank') is not None else None,
-            "round_score": " ".join(athlete.get('score', '').split()) if athlete.get('score') else '',
+            "name": get('name', ''),
+            "country": get('country', ''),
+            "round_rank": int(rank) if rank is not None else None,
+            "round_score": " ".join(score.split()) if score else '',
         }
         base_row.update(event_meta)
         return base_row
 
     def _process_speed_final(self, athlete: Dict, row: Dict) -> Dict:
         for stage in athlete.get('speed_elimination_stages', []):
-            stage_name = stage.get('name', '')
+            get = stage.get
+            stage_name = get('name', '')
             if stage_name:
-                row[f"{stage_name}_winner"] = stage.get('winner') == 1
-                if stage.get('time'):
-                    row[f"{stage_name}_time"] = stage['time'] / 1000
-                elif stage.get('score'):
-                    row[f"{stage_name}_time"] = stage.get('score')
+                row[f"{stage_name}_winner"] = get('winner') == 1
+                stage_time = get('time')
+                if stage_time:
+                    row[f"{stage_name}_time"] = stage_time / 1000
+                else:
+                    stage_score = get('score')
+                    if stage_score:
+                        row[f"{stage_name}_time"] = stage_score
         return row
 
     def _process_combined_stages(self, athlete: Dict, row: Dict) -> Dict:
@@ -245,17 +368,19 @@ class IFSCScraper:
             
             elif stage_name == 'Boulder':
                 for ascent in stage.get('ascents', []):
-                    digits = ''.join(filter(str.isdigit, ascent.get("route_name", "")))
+                    get = ascent.get
+                    digits = ''.join(filter(str.isdigit, get("route_name", "")))
                     if digits:
                         p = int(digits)
-                        row[f"P{p}_Top"] = ascent.get("top_tries", "X") if ascent.get("top") else "X"
-                        row[f"P{p}_Zone"] = ascent.get("zone_tries", "X") if ascent.get("zone") else "X"
+                        row[f"P{p}_Top"] = get("top_tries", "X") if get("top") else "X"
+                        row[f"P{p}_Zone"] = get("zone_tries", "X") if get("zone") else "X"
             
             elif stage_name == 'Lead':
                 for ascent in stage.get('ascents', []):
-                    digits = ''.join(filter(str.isdigit, ascent.get("route_name", "")))
+                    get = ascent.get
+                    digits = ''.join(filter(str.isdigit, get("route_name", "")))
                     if digits:
-                        row[f"Route_{int(digits)}"] = ascent.get("score", "")
+                        row[f"Route_{int(digits)}"] = get("score", "")
         return row
 
     def _process_lead_pre_2020(self, athlete: Dict, row: Dict) -> Dict:
@@ -272,25 +397,29 @@ class IFSCScraper:
         discipline = event.get('discipline', '')
         
         for ascent in athlete.get('ascents', []):
-            route_name = ascent.get("route_name", "")
-            digits = ''.join(filter(str.isdigit, route_name))
+            get = ascent.get
+            route_name = get("route_name", "")
+            
+            if discipline == 'Speed':
+                # Speed routes are keyed by name, so no route number is needed
+                time_ms = get('time_ms')
+                if time_ms:
+                    row[f"Quali_time_{route_name}"] = time_ms / 1000
+                elif get('dns'):
+                    row[f"Quali_time_{route_name}"] = 'DNS'
+                elif get('dnf'):
+                    row[f"Quali_time_{route_name}"] = 'DNF'
+                continue
             
+            digits = ''.join(filter(str.isdigit, route_name))
             if discipline == 'Boulder' and digits:
                 p = int(digits)
-                row[f"P{p}_Top"] = ascent.get("top_tries", "X") if ascent.get("top") else "X"
-                row[f"P{p}_Zone"] = ascent.get("zone_tries", "X") if ascent.get("zone") else "X"
+                row[f"P{p}_Top"] = get("top_tries", "X") if get("top") else "X"
+                row[f"P{p}_Zone"] = get("zone_tries", "X") if get("zone") else "X"
                 
             elif discipline == 'Lead' and digits:
                 p = int(digits)
-                row[f"Route_{p}"] = ascent.get("score", "")
-                
-            elif discipline == 'Speed':
-                if ascent.get('time_ms'):
-                    row[f"Quali_time_{route_name}"] = ascent['time_ms'] / 1000
-                elif ascent.get('dns'):
-                    row[f"Quali_time_{route_name}"] = 'DNS'
-                elif ascent.get('dnf'):
-                    row[f"Quali_time_{route_name}"] = 'DNF'
+                row[f"Route_{p}"] = get("score", "")
         return row
 
     def parse_round_result(self, event: Dict) -> pd.DataFrame:
@@ -310,7 +439,8 @@ class IFSCScraper:
         if not result_url:
             return pd.DataFrame()
         
-        data = self.get_api_data(result_url)
+        # Results of past seasons are final, so they can come from the cache
+        data = self.get_api_data(result_url, cache=year < datetime.now().year)
         if not data or 'cancel' in data.get('event', '').lower():
             return pd.DataFrame()
         
@@ -7,9 +7,16 @@ from pathlib import Path
 import numpy as np
 from datetime import datetime, timedelta
 
+# Columns used by this tab, read from the Parquet copy when available
+DATA_COLUMNS = ['name', 'year', 'discipline', 'gender', 'event_name', 'location', 'start_date', 'round_rank']
+
 def load_data():
     """Load aggregated competition data."""
     try:
+        parquet_file = Path("Data/aggregate_data/aggregated_results.parquet")
+        if parquet_file.exists():
+            return pd.read_parquet(parquet_file, columns=DATA_COLUMNS)
+        
         data_file = Path("Data/aggregate_data/aggregated_results.csv")
         if not data_file.exists():
             return None
@@ -28,6 +35,7 @@ def load_elo_data():
     except Exception as e:
         return None
 
+@st.fragment
 def render():
     """Render the athlete analytics dashboard."""
     
@@ -145,7 +153,7 @@ def render_individual_analysis(df, elo_df):
     if len(athlete_df['discipline'].unique()) > 1:
         st.subheader("Performance by Discipline")
         
-        discipline_stats = athlete_df.groupby('discipline').agg({
+        discipline_stats = athlete_df.groupby('discipline', observed=True).agg({
             'round_rank': ['count', 'mean', 'min'] if 'round_rank' in athlete_df.columns else ['count'],
             'year': ['min', 'max']
         }).round(2)
@@ -295,7 +303,7 @@ def render_location_performance(df):
     
     # Performance by location
     if 'round_rank' in athlete_location_df.columns:
-        location_performance = athlete_location_df.groupby('location').agg({
+        location_performance = athlete_location_df.groupby('location', observed=True).agg({
             'round_rank': ['mean', 'count', 'min'],
             'year': ['min', 'max']
         }).round(2)
@@ -346,7 +354,7 @@ def render_location_performance(df):
     st.subheader("Global Performance Trends")
     
     # Overall location statistics
-    global_location_stats = location_df.groupby('location').agg({
+    global_location_stats = location_df.groupby('location', observed=True).agg({
         'name': 'nunique',
         'round_rank': 'mean' if 'round_rank' in location_df.columns else 'count',
         'year': ['min', 'max']
@@ -38,9 +38,16 @@ def get_flag_emoji(country_code):
     """Get flag emoji for country code, return country code if not found."""
     return COUNTRY_FLAGS.get(country_code, "")
 
+# Columns used by this tab, read from the Parquet copy when available
+DATA_COLUMNS = ['name', 'country', 'year', 'discipline', 'gender', 'event_name', 'round_rank']
+
 def load_data():
     """Load aggregated competition data."""
     try:
+        parquet_file = Path("Data/aggregate_data/aggregated_results.parquet")
+        if parquet_file.exists():
+            return pd.read_parquet(parquet_file, columns=DATA_COLUMNS)
+        
         data_file = Path("Data/aggregate_data/aggregated_results.csv")
         if not data_file.exists():
             return None
@@ -110,7 +117,7 @@ def render():
     col1, col2, col3 = st.columns(3)
     
     # Country participation metrics
-    country_stats = filtered_df.groupby('country').agg({
+    country_stats = filtered_df.groupby('country', observed=True).agg({
         'name': 'nunique',
         'year': ['nunique', 'min', 'max'],
         'event_name': 'nunique'
@@ -118,6 +125,7 @@ def render():
     
     country_stats.columns = ['athletes', 'years_active', 'first_year', 'last_year', 'events']
     country_stats = country_stats.reset_index()
+    country_stats['country'] = country_stats['country'].astype(str)
     country_stats['flag'] = country_stats['country'].apply(get_flag_emoji)
     
     with col1:
@@ -178,23 +186,25 @@ def render():
         
         # Calculate performance metrics
         performance_df = filtered_df.dropna(subset=['round_rank'])
-        country_performance = performance_df.groupby('country').agg({
+        country_performance = performance_df.groupby('country', observed=True).agg({
             'round_rank': ['mean', 'median', 'count'],
             'name': 'nunique'
         }).round(2)
         
         country_performance.columns = ['avg_rank', 'median_rank', 'competitions', 'athletes']
         country_performance = country_performance.reset_index()
+        country_performance['country'] = country_performance['country'].astype(str)
         country_performance = country_performance[country_performance['competitions'] >= 10]  # Filter for meaningful sample size
         country_performance['flag'] = country_performance['country'].apply(get_flag_emoji)
         country_performance['country_flag'] = country_performance['flag'] + ' ' + country_performance['country']
         
         # Podium analysis
         podium_df = performance_df[performance_df['round_rank'] <= 3]
-        podium_counts = podium_df.groupby(['country', 'round_rank']).size().unstack(fill_value=0)
+        podium_counts = podium_df.groupby(['country', 'round_rank'], observed=True).size().unstack(fill_value=0)
         podium_counts.columns = [f'Rank_{int(col)}' for col in podium_counts.columns]
         podium_counts['total_podiums'] = podium_counts.sum(axis=1)
         podium_counts = podium_counts.reset_index()
+        podium_counts['country'] = podium_counts['country'].astype(str)
         podium_counts['flag'] = podium_counts['country'].apply(get_flag_emoji)
         
         col_perf1, col_perf2 = st.columns(2)
@@ -235,7 +245,7 @@ def render():
     st.subheader("Growth Trends")
     
     # Athletes per year by top countries
-    yearly_participation = filtered_df.groupby(['year', 'country'])['name'].nunique().reset_index()
+    yearly_participation = filtered_df.groupby(['year', 'country'], observed=True)['name'].nunique().reset_index()
     yearly_participation.rename(columns={'name': 'athletes'}, inplace=True)
     
     # Get top 8 countries for cleaner visualization
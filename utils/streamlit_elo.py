@@ -5,6 +5,7 @@ import plotly.graph_objects as go
 from pathlib import Path
 import numpy as np
 
+@st.fragment
 def render(analyzer, calculator, filters):
     """Render the ELO Rankings tab with improved error handling and performance."""
     
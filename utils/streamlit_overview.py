@@ -6,9 +6,16 @@ from plotly.subplots import make_subplots
 from pathlib import Path
 import numpy as np
 
+# Columns used by this tab, read from the Parquet copy when available
+DATA_COLUMNS = ['name', 'country', 'year', 'discipline', 'gender', 'event_name', 'scoring_era', 'start_date']
+
 def load_data():
     """Load aggregated competition data."""
     try:
+        parquet_file = Path("Data/aggregate_data/aggregated_results.parquet")
+        if parquet_file.exists():
+            return pd.read_parquet(parquet_file, columns=DATA_COLUMNS)
+        
         data_file = Path("Data/aggregate_data/aggregated_results.csv")
         if not data_file.exists():
             return None
@@ -58,7 +65,7 @@ def render():
     with col_left:
         # Competitions by year and discipline
         st.subheader("Competitions Over Time")
-        yearly_discipline = df.groupby(['year', 'discipline']).size().reset_index(name='count')
+        yearly_discipline = df.groupby(['year', 'discipline'], observed=True).size().reset_index(name='count')
         
         fig_yearly = px.line(
             yearly_discipline,
@@ -73,7 +80,7 @@ def render():
         
         # Gender participation over time
         st.subheader("Gender Participation")
-        yearly_gender = df.groupby(['year', 'gender']).size().reset_index(name='count')
+        yearly_gender = df.groupby(['year', 'gender'], observed=True).size().reset_index(name='count')
         
         fig_gender = px.area(
             yearly_gender,
@@ -114,7 +121,7 @@ def render():
     st.subheader("Detailed Analytics")
     
     # Athletes per competition over time
-    athletes_per_comp =  df[~df['discipline'].isin(['Boulder&lead', 'Combined'])].groupby(['year', 'discipline']).agg({
+    athletes_per_comp =  df[~df['discipline'].isin(['Boulder&lead', 'Combined'])].groupby(['year', 'discipline'], observed=True).agg({
         'name': 'nunique',
         'event_name': 'nunique'
     }).reset_index()
@@ -147,7 +154,7 @@ def render():
         }
     if 'scoring_era' in df.columns:
         st.subheader("Scoring System Evolution")
-        era_timeline = df[~df['discipline'].isin(['Boulder&lead', 'Combined'])].groupby(['year', 'scoring_era']).size().reset_index(name='count')
+        era_timeline = df[~df['discipline'].isin(['Boulder&lead', 'Combined'])].groupby(['year', 'scoring_era'], observed=True).size().reset_index(name='count')
         
         fig_eras = px.bar(
             era_timeline,
@@ -170,7 +177,7 @@ def render():
         
         if not df_with_dates.empty:
             df_with_dates['month'] = df_with_dates['start_date'].dt.month
-            monthly_counts = df_with_dates.groupby(['year', 'month']).size().reset_index(name='competitions')
+            monthly_counts = df_with_dates.groupby(['year', 'month'], observed=True).size().reset_index(name='competitions')
             
             # Create pivot for heatmap
             heatmap_data = monthly_counts.pivot(index='year', columns='month', values='competitions').fillna(0)